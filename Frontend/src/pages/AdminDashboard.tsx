@@ -53,12 +53,12 @@ export default function AdminDashboard() {
       const [statsRes, bookingsRes, hallsRes, usersRes] = await Promise.all([
         axios.get(`${API_BASE}/admin/stats`, { withCredentials: true }),
         axios.get(`${API_BASE}/admin/bookings?limit=50`, { withCredentials: true }),
-        axios.get(`${API_BASE}/admin/halls`, { withCredentials: true }),
-        axios.get(`${API_BASE}/admin/users`, { withCredentials: true })
+        axios.get(`${API_BASE}/admin/halls?limit=200`, { withCredentials: true }),
+        axios.get(`${API_BASE}/admin/users?limit=200`, { withCredentials: true })
       ]);
 
       // Transform API data to match UI format
-      const transformedBookings = bookingsRes.data.map((b: any) => ({
+      const transformedBookings = bookingsRes.data.items.map((b: any) => ({
         id: b.id,
         ref: b.booking_ref || `BK-${b.id.toString().padStart(4, '0')}`,
         user: b.user_name,
@@ -70,7 +70,7 @@ export default function AdminDashboard() {
         guests: b.guests || 0
       }));
 
-      const transformedHalls = hallsRes.data.map((h: any) => ({
+      const transformedHalls = hallsRes.data.items.map((h: any) => ({
         id: h.id,
         name: h.name,
         city: h.city || "N/A",
@@ -80,7 +80,7 @@ export default function AdminDashboard() {
         image: h.image_url || "https://images.unsplash.com/photo-1519167758481-83f550bb49b3?w=400"
       }));
 
-      const transformedUsers = usersRes.data.map((u: any) => ({
+      const transformedUsers = usersRes.data.items.map((u: any) => ({
         id: u.id,
         name: u.name,
         email: u.email,
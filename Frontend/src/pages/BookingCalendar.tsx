@@ -15,15 +15,29 @@ export default function BookingCalendar({ hallId }: { hallId: number }) {
   const [bookings, setBookings] = useState<any[]>([])
   const [loading, setLoading] = useState(false)
 
-  // Load all bookings of this hall
+  const [viewMonth, setViewMonth] = useState<Date>(new Date())
+
+  // Occupied hours of the visible month as [first_hour, length] runs
+  const loadMonth = async (month: Date) => {
+    const key = `${month.getFullYear()}-${String(month.getMonth() + 1).padStart(2, "0")}`
+    const res = await axios.get(`${API_BASE}/bookings/hall/${hallId}/calendar`, {
+      params: { month: key, encoding: "runs" },
+    })
+    const monthStart = new Date(res.data.start)
+    const hour = 60 * 60 * 1000
+    setBookings(
+      res.data.runs.map(([first, length]: [number, number]) => ({
+        start_time: new Date(monthStart.getTime() + first * hour),
+        end_time: new Date(monthStart.getTime() + (first + length) * hour),
+      }))
+    )
+  }
+
   useEffect(() => {
     if (!hallId) return
 
-    axios
-      .get(`${API_BASE}/bookings/hall/${hallId}`)
-      .then((res) => setBookings(res.data))
-      .catch((err) => console.log(err))
-  }, [hallId])
+    loadMonth(viewMonth).catch((err) => console.log(err))
+  }, [hallId, viewMonth])
 
 
   //  Convert time → Date
@@ -91,8 +105,7 @@ export default function BookingCalendar({ hallId }: { hallId: number }) {
       toast.success("✅ Booking successful")
 
       // Re-fetch updated data
-      const refreshed = await axios.get(`${API_BASE}/bookings/hall/${hallId}`)
-      setBookings(refreshed.data)
+      await loadMonth(viewMonth)
 
     } catch (err: any) {
       toast.error(err?.response?.data?.detail || "Booking failed")
@@ -113,6 +126,9 @@ export default function BookingCalendar({ hallId }: { hallId: number }) {
       <Calendar
         value={date}
         onChange={(d: any) => setDate(d)}
+        onActiveStartDateChange={({ activeStartDate }: any) =>
+          activeStartDate && setViewMonth(activeStartDate)
+        }
         tileClassName={({ date }) =>
           isDateBooked(date)
             ? "bg-red-500 text-white rounded-lg"
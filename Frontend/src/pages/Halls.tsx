@@ -437,9 +437,9 @@ export default function App() {
   useEffect(() => {
     const fetchHalls = async () => {
       try {
-        const res = await axios.get(`${API_BASE}/halls/`);
+        const res = await axios.get(`${API_BASE}/halls/?limit=200`);
         // Transform API data to match UI expected format
-        const apiHalls = res.data.map((h: any) => ({
+        const apiHalls = res.data.items.map((h: any) => ({
           id: h.id,
           name: h.name,
           latitude: h.latitude,
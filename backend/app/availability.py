@@ -0,0 +1,135 @@
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+import os, threading, time
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+ACTIVE_STATUSES = ("confirmed", "pending")
+AVAILABILITY_CACHE_TTL = int(os.getenv("AVAILABILITY_CACHE_TTL", "30"))
+
+
+class HallIntervals:
+    """Bookings of one hall kept sorted by start time.
+
+    `_max_end[i]` is the latest end among the first i+1 intervals, so an
+    overlap test is a single bisect even if legacy rows overlap each other.
+    """
+
+    def __init__(self, intervals=()):
+        self._intervals = sorted(intervals)
+        self._reindex()
+
+    def _reindex(self):
+        self._starts = [start for start, _, _ in self._intervals]
+        self._max_end = []
+        latest = None
+        for _, end, _ in self._intervals:
+            latest = end if latest is None or end > latest else latest
+            self._max_end.append(latest)
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def add(self, start: datetime, end: datetime, booking_id: int):
+        insort(self._intervals, (start, end, booking_id))
+        self._reindex()
+
+    def discard(self, booking_id: int):
+        self._intervals = [i for i in self._intervals if i[2] != booking_id]
+        self._reindex()
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        # intervals before `i` start before `end`; one of them must also
+        # end after `start` to collide
+        i = bisect_left(self._starts, end)
+        return i == 0 or self._max_end[i - 1] <= start
+
+    def busy(self, start: datetime, end: datetime):
+        i = bisect_left(self._starts, end)
+        # walk back only while an earlier interval could still reach `start`
+        j = i
+        while j > 0 and self._max_end[j - 1] > start:
+            j -= 1
+        return [(s, e) for s, e, _ in self._intervals[j:i] if e > start]
+
+    def free_slots(self, start: datetime, end: datetime):
+        slots = []
+        cursor = start
+        for busy_start, busy_end in self.busy(start, end):
+            if busy_start > cursor:
+                slots.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if cursor < end:
+            slots.append((cursor, end))
+        return slots
+
+
+class AvailabilityIndex:
+    """Warm per-hall interval cache in front of ix_bookings_hall_status_time.
+
+    Each hall is loaded with one indexed query and reloaded after
+    AVAILABILITY_CACHE_TTL seconds so writes made by other workers show up.
+    The overlap check in create_booking still runs against the database.
+    """
+
+    def __init__(self, ttl: int = AVAILABILITY_CACHE_TTL):
+        self.ttl = ttl
+        self._halls = {}
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, hall_id: int) -> HallIntervals:
+        rows = (
+            db.query(models.Booking.start_time, models.Booking.end_time, models.Booking.id)
+            .filter(
+                models.Booking.hall_id == hall_id,
+                models.Booking.status.in_(ACTIVE_STATUSES),
+            )
+            .all()
+        )
+        return HallIntervals(tuple(r) for r in rows if r[0] and r[1])
+
+    def hall(self, db: Session, hall_id: int) -> HallIntervals:
+        with self._lock:
+            entry = self._halls.get(hall_id)
+            if entry and entry[1] > time.monotonic():
+                return entry[0]
+
+        intervals = self._load(db, hall_id)
+        with self._lock:
+            self._halls[hall_id] = (intervals, time.monotonic() + self.ttl)
+        return intervals
+
+    def is_free(self, db: Session, hall_id: int, start: datetime, end: datetime) -> bool:
+        intervals = self.hall(db, hall_id)
+        with self._lock:
+            return intervals.is_free(start, end)
+
+    def free_slots(self, db: Session, hall_id: int, day: datetime):
+        intervals = self.hall(db, hall_id)
+        with self._lock:
+            return intervals.free_slots(day, day + timedelta(days=1))
+
+    def add(self, booking: models.Booking):
+        with self._lock:
+            entry = self._halls.get(booking.hall_id)
+            if entry:
+                entry[0].add(booking.start_time, booking.end_time, booking.id)
+
+    def discard(self, booking: models.Booking):
+        with self._lock:
+            entry = self._halls.get(booking.hall_id)
+            if entry:
+                entry[0].discard(booking.id)
+
+    def invalidate(self, hall_id: int = None):
+        with self._lock:
+            if hall_id is None:
+                self._halls.clear()
+            else:
+                self._halls.pop(hall_id, None)
+
+
+availability_index = AvailabilityIndex()
@@ -0,0 +1,28 @@
+import asyncio, logging
+
+from app.database import SessionLocal
+
+
+logger = logging.getLogger(__name__)
+
+
+def run_with_session(job):
+    db = SessionLocal()
+    try:
+        return job(db)
+    finally:
+        db.close()
+
+
+async def run_periodically(name: str, interval: float, job):
+    """Run `job(db)` every `interval` seconds on a worker thread.
+
+    Failures are logged and retried on the next tick so one bad run does
+    not stop the loop.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(run_with_session, job)
+        except Exception:
+            logger.exception("Background job %s failed", name)
+        await asyncio.sleep(interval)
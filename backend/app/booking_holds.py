@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+import os, threading
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app import models, stats
+from app.availability import availability_index
+from app.occupancy import invalidate_calendar
+from app.user_summary import record_bulk_status_change
+
+
+# How long a pending booking holds its slot before it is released. Every
+# customer booking is a hold; admins' own bookings (queued on a customer's
+# behalf) only when they ask for one. 0 disables holds.
+PENDING_HOLD_MINUTES = int(os.getenv("PENDING_HOLD_MINUTES", "1440"))
+HOLD_RELEASE_INTERVAL = int(os.getenv("HOLD_RELEASE_INTERVAL", "60"))
+HOLD_RELEASE_BATCH = int(os.getenv("HOLD_RELEASE_BATCH", "500"))
+
+
+def hold_expiry(user: models.User, requested: bool = False, now: datetime = None):
+    """hold_expires_at for a new pending booking, or None if it is not a hold."""
+    if PENDING_HOLD_MINUTES <= 0 or (user.is_admin and not requested):
+        return None
+    return (now or datetime.utcnow()) + timedelta(minutes=PENDING_HOLD_MINUTES)
+
+
+class HoldReleaser:
+    """Cancels pending holds whose hold_expires_at has passed, in batches.
+
+    Expired holds are found on ix_bookings_status_hold_expires and each
+    batch is one UPDATE and one commit, like the session reaper. Bookings
+    without hold_expires_at are never touched.
+    """
+
+    def __init__(self, batch_size: int = HOLD_RELEASE_BATCH):
+        self.batch_size = batch_size
+        self.runs = 0
+        self.released_total = 0
+        self.last_run_at = None
+        self.last_released = 0
+        self._lock = threading.Lock()
+
+    def _expired(self, db: Session, now: datetime):
+        return db.query(models.Booking).filter(
+            models.Booking.status == "pending",
+            models.Booking.hold_expires_at <= now,
+        )
+
+    def release(self, db: Session) -> int:
+        Booking = models.Booking
+        now = datetime.utcnow()
+        released = 0
+
+        while True:
+            ids = [
+                row[0] for row in
+                self._expired(db, now)
+                .with_entities(Booking.id)
+                .order_by(Booking.hold_expires_at)
+                .limit(self.batch_size)
+                .all()
+            ]
+            if not ids:
+                break
+
+            # the status guard and RETURNING make the counters follow what
+            # the UPDATE changed, even if an admin confirmed a row meanwhile
+            changed = db.execute(
+                update(Booking)
+                .where(Booking.id.in_(ids), Booking.status == "pending")
+                .values(status="cancelled")
+                .returning(Booking.user_id, Booking.hall_id),
+                execution_options={"synchronize_session": False},
+            ).all()
+
+            # pending bookings carry no revenue, so only the status counters move
+            stats.bump(db, **{"bookings:pending": -len(changed), "bookings:cancelled": len(changed)})
+            record_bulk_status_change(db, {row.user_id for row in changed})
+            db.commit()
+
+            hall_ids = {row.hall_id for row in changed}
+            for hall_id in hall_ids:
+                availability_index.invalidate(hall_id)
+            invalidate_calendar(*hall_ids)
+            released += len(changed)
+
+            if len(ids) < self.batch_size:
+                break
+
+        with self._lock:
+            self.runs += 1
+            self.released_total += released
+            self.last_run_at = now
+            self.last_released = released
+        return released
+
+    def stats(self, db: Session) -> dict:
+        expired = (
+            self._expired(db, datetime.utcnow())
+            .with_entities(func.count(models.Booking.id))
+            .scalar()
+        )
+        with self._lock:
+            return {
+                "hold_minutes": PENDING_HOLD_MINUTES,
+                "expired_pending": expired,
+                "runs": self.runs,
+                "released_total": self.released_total,
+                "last_run_at": self.last_run_at,
+                "last_released": self.last_released,
+            }
+
+
+hold_releaser = HoldReleaser()
@@ -0,0 +1,117 @@
+import logging, re
+
+from sqlalchemy import DateTime, Float, Integer, String, literal, or_, select, text
+from sqlalchemy.exc import OperationalError
+
+from app import models
+
+
+logger = logging.getLogger(__name__)
+
+# Set by setup_fulltext_index() once the FTS5 tables exist.
+FTS_ENABLED = False
+
+MAX_QUERY_TERMS = 8
+
+# (table, fts columns) indexed as external-content FTS5 tables
+_FTS_TABLES = {
+    "halls": ["name", "city", "description"],
+    "events": ["title", "category", "description"],
+}
+
+
+def _fts_ddl(table: str, columns):
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"""CREATE VIRTUAL TABLE {fts} USING fts5(
+            {cols}, content='{table}', content_rowid='id',
+            prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+        )""",
+        f"""CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});
+        END""",
+        f"""CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});
+        END""",
+        f"""CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});
+        END""",
+        # index rows that existed before the table
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def setup_fulltext_index(engine):
+    """Create FTS5 indexes over halls and events, kept in sync by triggers.
+
+    Only runs the DDL for tables that do not exist yet, so the one-off
+    rebuild happens once. Without SQLite/FTS5 the search falls back to
+    LIKE matching.
+    """
+    global FTS_ENABLED
+    if engine.dialect.name != "sqlite":
+        return
+
+    try:
+        with engine.begin() as conn:
+            for table, columns in _FTS_TABLES.items():
+                exists = conn.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    (f"{table}_fts",),
+                ).first()
+                if not exists:
+                    for statement in _fts_ddl(table, columns):
+                        conn.exec_driver_sql(statement)
+        FTS_ENABLED = True
+    except OperationalError:
+        logger.warning("SQLite FTS5 unavailable, /search falls back to LIKE matching")
+
+
+def query_terms(q: str):
+    return re.findall(r"\w+", q.lower())[:MAX_QUERY_TERMS]
+
+
+def match_expression(terms) -> str:
+    # every term must match, each as a prefix so typeahead works mid-word
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+def hall_search_statement(terms, limit: int):
+    if FTS_ENABLED:
+        # name hits outrank city hits, which outrank description hits
+        return text(
+            "SELECT h.id, h.name, h.city, bm25(halls_fts, 10.0, 4.0, 1.0) AS score "
+            "FROM halls_fts JOIN halls h ON h.id = halls_fts.rowid "
+            "WHERE halls_fts MATCH :q ORDER BY score LIMIT :limit"
+        ).bindparams(q=match_expression(terms), limit=limit).columns(
+            id=Integer, name=String, city=String, score=Float
+        )
+
+    Hall = models.Hall
+    conditions = [
+        or_(Hall.name.ilike(f"%{t}%"), Hall.city.ilike(f"%{t}%"), Hall.description.ilike(f"%{t}%"))
+        for t in terms
+    ]
+    return select(Hall.id, Hall.name, Hall.city, literal(0.0).label("score")).where(*conditions).limit(limit)
+
+
+def event_search_statement(terms, limit: int):
+    if FTS_ENABLED:
+        return text(
+            "SELECT e.id, e.title, e.date, bm25(events_fts, 10.0, 4.0, 1.0) AS score "
+            "FROM events_fts JOIN events e ON e.id = events_fts.rowid "
+            "WHERE events_fts MATCH :q ORDER BY score LIMIT :limit"
+        ).bindparams(q=match_expression(terms), limit=limit).columns(
+            id=Integer, title=String, date=DateTime, score=Float
+        )
+
+    Event = models.Event
+    conditions = [
+        or_(Event.title.ilike(f"%{t}%"), Event.category.ilike(f"%{t}%"), Event.description.ilike(f"%{t}%"))
+        for t in terms
+    ]
+    return select(Event.id, Event.title, Event.date, literal(0.0).label("score")).where(*conditions).limit(limit)
@@ -0,0 +1,106 @@
+from math import asin, cos, radians, sin, sqrt
+import logging
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+
+from app import models
+
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+
+# Set by setup_spatial_index() once the SQLite R-tree exists.
+RTREE_ENABLED = False
+
+_RTREE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS halls_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng)",
+    """CREATE TRIGGER IF NOT EXISTS halls_rtree_ai AFTER INSERT ON halls
+       WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL
+       BEGIN
+           INSERT INTO halls_rtree VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS halls_rtree_ad AFTER DELETE ON halls
+       BEGIN
+           DELETE FROM halls_rtree WHERE id = old.id;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS halls_rtree_au AFTER UPDATE OF latitude, longitude ON halls
+       BEGIN
+           DELETE FROM halls_rtree WHERE id = old.id;
+           INSERT INTO halls_rtree
+           SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+           WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+       END""",
+    # halls that existed before the index
+    """INSERT INTO halls_rtree
+       SELECT id, latitude, latitude, longitude, longitude FROM halls
+       WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+       AND id NOT IN (SELECT id FROM halls_rtree)""",
+]
+
+
+def setup_spatial_index(engine):
+    """Create the R-tree over hall coordinates, kept in sync by triggers.
+
+    Triggers also cover halls written outside the API (seed scripts).
+    Other databases, or SQLite builds without the rtree module, use the
+    bounding box on ix_halls_lat_lng instead.
+    """
+    global RTREE_ENABLED
+    if engine.dialect.name != "sqlite":
+        return
+
+    try:
+        with engine.begin() as conn:
+            for statement in _RTREE_DDL:
+                conn.exec_driver_sql(statement)
+        RTREE_ENABLED = True
+    except OperationalError:
+        logger.warning("SQLite rtree module unavailable, nearby search uses the lat/lng index")
+
+
+def bounding_box(lat: float, lng: float, radius_km: float):
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    # longitude degrees shrink towards the poles
+    dlng = radius_km / (KM_PER_DEGREE_LAT * max(cos(radians(lat)), 1e-6))
+    return (
+        max(lat - dlat, -90.0), min(lat + dlat, 90.0),
+        max(lng - dlng, -180.0), min(lng + dlng, 180.0),
+    )
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    dlat = radians(lat2 - lat1)
+    dlng = radians(lng2 - lng1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+def nearby_candidates(lat: float, lng: float, radius_km: float):
+    """select() of halls inside the bounding box of the search circle."""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+
+    if RTREE_ENABLED:
+        ids = text(
+            "SELECT id FROM halls_rtree "
+            "WHERE max_lat >= :min_lat AND min_lat <= :max_lat "
+            "AND max_lng >= :min_lng AND min_lng <= :max_lng"
+        ).bindparams(min_lat=min_lat, max_lat=max_lat, min_lng=min_lng, max_lng=max_lng)
+        return select(models.Hall).where(models.Hall.id.in_(ids.columns(id=models.Hall.id.type)))
+
+    return select(models.Hall).where(
+        models.Hall.latitude.between(min_lat, max_lat),
+        models.Hall.longitude.between(min_lng, max_lng),
+    )
+
+
+def rank_by_distance(halls, lat: float, lng: float, radius_km: float, limit: int):
+    ranked = []
+    for hall in halls:
+        distance = haversine_km(lat, lng, hall.latitude, hall.longitude)
+        if distance <= radius_km:
+            ranked.append((distance, hall))
+    ranked.sort(key=lambda r: r[0])
+    return ranked[:limit]
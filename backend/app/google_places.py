@@ -0,0 +1,115 @@
+import asyncio, os
+
+import httpx
+from fastapi import HTTPException
+
+from app.response_cache import InMemoryBackend
+
+
+GOOGLE_PLACES_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
+# point at google_stub_server.py for local runs and tests
+GOOGLE_MAPS_BASE_URL = os.getenv("GOOGLE_MAPS_BASE_URL", "https://maps.googleapis.com/maps/api")
+GOOGLE_HTTP_TIMEOUT = float(os.getenv("GOOGLE_HTTP_TIMEOUT", "5"))
+GOOGLE_MAX_CONNECTIONS = int(os.getenv("GOOGLE_MAX_CONNECTIONS", "20"))
+GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", "86400"))
+NEARBY_CACHE_TTL = int(os.getenv("NEARBY_CACHE_TTL", "600"))
+
+
+class GooglePlacesClient:
+    """Shared async client for the Geocode and Places APIs.
+
+    Connections are pooled, every call has a timeout, successful answers
+    are cached, and identical lookups already in flight are awaited
+    rather than sent again.
+    """
+
+    def __init__(self):
+        self.upstream_calls = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self._client = None
+        self._cache = InMemoryBackend(maxsize=4096)
+        self._inflight = {}
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=GOOGLE_MAPS_BASE_URL,
+                timeout=httpx.Timeout(GOOGLE_HTTP_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=GOOGLE_MAX_CONNECTIONS,
+                    max_keepalive_connections=GOOGLE_MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_json(self, path: str, params: dict) -> dict:
+        self.upstream_calls += 1
+        try:
+            res = await self._http().get(path, params={**params, "key": GOOGLE_PLACES_API_KEY})
+            res.raise_for_status()
+            return res.json()
+        except httpx.TimeoutException:
+            raise HTTPException(504, detail="Google API timed out")
+        except (httpx.HTTPError, ValueError):
+            raise HTTPException(502, detail="Google API error")
+
+    async def _cached(self, key: str, ttl: int, fetch, cacheable):
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(fetch())
+        self._inflight[key] = task
+        try:
+            result = await asyncio.shield(task)
+        finally:
+            self._inflight.pop(key, None)
+
+        if cacheable(result):
+            self._cache.set(key, result, ttl)
+        return result
+
+    async def geocode(self, address: str) -> dict:
+        return await self._cached(
+            f"geocode:{address.strip().lower()}",
+            GEOCODE_CACHE_TTL,
+            lambda: self._get_json("/geocode/json", {"address": address}),
+            lambda data: data.get("status") == "OK",
+        )
+
+    async def nearby(self, lat: float, lng: float, radius: int, keyword: str) -> dict:
+        # ~10m grid so nearby repeats of a search share an entry
+        key = f"nearby:{lat:.4f}:{lng:.4f}:{radius}:{keyword}"
+        return await self._cached(
+            key,
+            NEARBY_CACHE_TTL,
+            lambda: self._get_json("/place/nearbysearch/json", {
+                "location": f"{lat},{lng}",
+                "radius": radius,
+                "keyword": keyword,
+            }),
+            lambda data: data.get("status") in ["OK", "ZERO_RESULTS"],
+        )
+
+    def stats(self) -> dict:
+        return {
+            "upstream_calls": self.upstream_calls,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+
+google_places = GooglePlacesClient()
@@ -0,0 +1,83 @@
+import csv, io, json
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app import models, schemas, stats
+
+
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+
+def parse_rows(binary_file, fmt: str):
+    """Yield (line_number, row) from an uploaded file, one row at a time.
+
+    Unparseable input is yielded as an exception in place of the row.
+    """
+    stream = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            for row in reader:
+                # blank cells mean "not provided" rather than empty strings
+                yield reader.line_num, {k: (v if v != "" else None) for k, v in row.items() if k}
+        else:
+            for line, text in enumerate(stream, 1):
+                if not text.strip():
+                    continue
+                try:
+                    yield line, json.loads(text)
+                except json.JSONDecodeError as e:
+                    yield line, e
+    except (csv.Error, UnicodeDecodeError) as e:
+        # the rest of the file cannot be read
+        yield None, e
+
+
+def import_halls(db: Session, binary_file, fmt: str) -> dict:
+    """Validate rows against HallCreate and insert them in batches.
+
+    Each batch is one executemany INSERT and one commit; rows that fail
+    validation are skipped and reported with their line number.
+    """
+    table = models.Hall.__table__
+    batch = []
+    inserted = 0
+    failed = 0
+    errors = []
+
+    def flush():
+        nonlocal inserted
+        if batch:
+            db.execute(table.insert(), batch)
+            stats.bump(db, halls=len(batch))
+            db.commit()
+            inserted += len(batch)
+            batch.clear()
+
+    for line, row in parse_rows(binary_file, fmt):
+        try:
+            if isinstance(row, Exception):
+                raise ValueError(str(row))
+            if not isinstance(row, dict):
+                raise ValueError("Row must be an object")
+            batch.append(schemas.HallCreate.model_validate(row).model_dump())
+        except (ValidationError, ValueError) as e:
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                detail = e.errors(include_url=False, include_context=False) if isinstance(e, ValidationError) else str(e)
+                errors.append({"line": line, "errors": detail})
+            continue
+
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            flush()
+
+    flush()
+
+    return {
+        "inserted": inserted,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
@@ -0,0 +1,123 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Query
+from sqlalchemy import case, exists, func, select
+
+from app import models, schemas
+from app.availability import ACTIVE_STATUSES
+
+
+# upper edges of the price-per-hour facet buckets; the last one is open
+PRICE_BUCKET_EDGES = [2000, 4000, 6000, 8000, 10000]
+
+SORTS = {
+    "id": ([models.Hall.id], False),
+    "price_asc": ([models.Hall.price_per_hour, models.Hall.id], False),
+    "price_desc": ([models.Hall.price_per_hour, models.Hall.id], True),
+    "capacity_asc": ([models.Hall.capacity, models.Hall.id], False),
+    "capacity_desc": ([models.Hall.capacity, models.Hall.id], True),
+}
+
+
+class HallFilters:
+    """Query parameters for filtering and sorting the hall catalog."""
+
+    def __init__(
+        self,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+        guests: Optional[int] = Query(None, ge=1),
+        min_price: Optional[float] = Query(None, ge=0),
+        max_price: Optional[float] = Query(None, ge=0),
+        available_from: Optional[datetime] = None,
+        available_to: Optional[datetime] = None,
+        sort: str = Query("id", pattern="^(" + "|".join(SORTS) + ")$"),
+        facets: bool = False,
+    ):
+        # bookings are stored as naive UTC
+        available_from = schemas.naive_utc(available_from)
+        available_to = schemas.naive_utc(available_to)
+        if (available_from is None) != (available_to is None):
+            raise HTTPException(400, detail="available_from and available_to go together")
+        if available_from and available_to <= available_from:
+            raise HTTPException(400, detail="available_to must be after available_from")
+
+        self.city = city
+        self.state = state
+        self.guests = guests
+        self.min_price = min_price
+        self.max_price = max_price
+        self.available_from = available_from
+        self.available_to = available_to
+        self.sort = sort
+        self.facets = facets
+
+    @property
+    def depends_on_bookings(self) -> bool:
+        return self.available_from is not None
+
+    def apply(self, stmt):
+        Hall = models.Hall
+        if self.city:
+            stmt = stmt.where(Hall.city == self.city)
+        if self.state:
+            stmt = stmt.where(Hall.state == self.state)
+        if self.guests:
+            stmt = stmt.where(Hall.capacity >= self.guests)
+        if self.min_price is not None:
+            stmt = stmt.where(Hall.price_per_hour >= self.min_price)
+        if self.max_price is not None:
+            stmt = stmt.where(Hall.price_per_hour <= self.max_price)
+        if self.available_from:
+            # served by ix_bookings_hall_status_time
+            clash = exists().where(
+                models.Booking.hall_id == Hall.id,
+                models.Booking.status.in_(ACTIVE_STATUSES),
+                models.Booking.start_time < self.available_to,
+                models.Booking.end_time > self.available_from,
+            )
+            stmt = stmt.where(~clash)
+        return stmt
+
+    @property
+    def sort_columns(self):
+        return SORTS[self.sort]
+
+
+def _bucket_label(i: int) -> str:
+    low = PRICE_BUCKET_EDGES[i - 1] if i else 0
+    if i == len(PRICE_BUCKET_EDGES):
+        return f"{low}+"
+    return f"{low}-{PRICE_BUCKET_EDGES[i]}"
+
+
+def facet_statement(filters: HallFilters):
+    """One GROUP BY over the filtered halls yielding (city, bucket, count)."""
+    bucket = case(
+        *[
+            (models.Hall.price_per_hour < edge, i)
+            for i, edge in enumerate(PRICE_BUCKET_EDGES)
+        ],
+        else_=len(PRICE_BUCKET_EDGES),
+    ).label("bucket")
+
+    stmt = select(models.Hall.city, bucket, func.count(models.Hall.id))
+    return filters.apply(stmt).group_by(models.Hall.city, bucket)
+
+
+def build_facets(rows) -> dict:
+    cities = {}
+    buckets = [0] * (len(PRICE_BUCKET_EDGES) + 1)
+    for city, bucket, count in rows:
+        key = city or "Unknown"
+        cities[key] = cities.get(key, 0) + count
+        buckets[bucket] += count
+
+    return {
+        "cities": dict(sorted(cities.items(), key=lambda c: (-c[1], c[0]))),
+        "price_buckets": [
+            {"label": _bucket_label(i), "count": count}
+            for i, count in enumerate(buckets)
+        ],
+    }
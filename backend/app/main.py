@@ -1,12 +1,64 @@
+from contextlib import asynccontextmanager
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import inspect
 from app.database import Base, engine
-from app.routers import auth, halls, bookings, contact, events, dashboard, admin
+from app.background import run_periodically
+from app.geo import setup_spatial_index
+from app.fulltext import setup_fulltext_index
+from app.google_places import google_places
+from app.routers import auth, halls, bookings, contact, events, dashboard, admin, search
+from app import stats
+from app.session_reaper import session_reaper, SESSION_REAP_INTERVAL
+from app.booking_holds import hold_releaser, HOLD_RELEASE_INTERVAL, PENDING_HOLD_MINUTES
 
 # Create tables
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Event Booking API")
+# create_all skips tables that already exist, so add any new nullable
+# columns and indexes
+_inspector = inspect(engine)
+for table in Base.metadata.sorted_tables:
+    existing = {c["name"] for c in _inspector.get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing and column.nullable:
+            with engine.begin() as conn:
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                    f"{column.type.compile(dialect=engine.dialect)}"
+                )
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+setup_spatial_index(engine)
+setup_fulltext_index(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = [
+        asyncio.create_task(run_periodically(
+            "stats-reconcile", stats.STATS_RECONCILE_INTERVAL, stats.reconcile
+        )),
+        asyncio.create_task(run_periodically(
+            "session-reaper", SESSION_REAP_INTERVAL, session_reaper.reap
+        )),
+    ]
+    # PENDING_HOLD_MINUTES=0 disables holds, so there is nothing to release
+    if PENDING_HOLD_MINUTES > 0:
+        tasks.append(asyncio.create_task(run_periodically(
+            "hold-release", HOLD_RELEASE_INTERVAL, hold_releaser.release
+        )))
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await google_places.aclose()
+
+
+app = FastAPI(title="Event Booking API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -34,4 +86,5 @@ app.include_router(bookings.router)
 app.include_router(contact.router)
 app.include_router(events.router)
 app.include_router(dashboard.router)
-app.include_router(admin.router)
\ No newline at end of file
+app.include_router(admin.router)
+app.include_router(search.router)
\ No newline at end of file
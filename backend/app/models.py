@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -21,8 +21,8 @@ class Session(Base):
     __tablename__ = "sessions"
     id = Column(Integer, primary_key=True, index=True)
     token = Column(String(255), unique=True, index=True, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
-    expiration = Column(DateTime, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    expiration = Column(DateTime, nullable=False, index=True)
 
     user = relationship("User")
 
@@ -45,6 +45,17 @@ class Hall(Base):
 
     bookings = relationship("Booking", back_populates="hall", cascade="all, delete")
 
+    __table_args__ = (
+        # bounding-box fallback for nearby search when the R-tree is unavailable
+        Index("ix_halls_lat_lng", "latitude", "longitude"),
+        # catalog filters and sorts
+        Index("ix_halls_city_price", "city", "price_per_hour"),
+        Index("ix_halls_city_capacity", "city", "capacity"),
+        Index("ix_halls_state_city", "state", "city"),
+        Index("ix_halls_price", "price_per_hour"),
+        Index("ix_halls_capacity", "capacity"),
+    )
+
 
 #  BOOKING
 class Booking(Base):
@@ -69,10 +80,54 @@ class Booking(Base):
     
     status = Column(String, default="pending")
     created_at = Column(DateTime, default=datetime.utcnow)
+    # set only for bookings made as a temporary hold; see app/booking_holds.py
+    hold_expires_at = Column(DateTime, nullable=True)
 
     user = relationship("User", back_populates="bookings")
     hall = relationship("Hall", back_populates="bookings")
 
+    __table_args__ = (
+        # serves the per-hall overlap check and availability lookups
+        Index("ix_bookings_hall_status_time", "hall_id", "status", "start_time", "end_time"),
+        # per-user dashboard aggregates
+        Index("ix_bookings_user_start", "user_id", "start_time"),
+        # expired pending holds first, for the hold release job
+        Index("ix_bookings_status_hold_expires", "status", "hold_expires_at"),
+    )
+
+
+#  USER DASHBOARD SUMMARY
+# Maintained by app/user_summary.py alongside booking writes.
+class UserSummary(Base):
+    __tablename__ = "user_summaries"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_bookings = Column(Integer, default=0, nullable=False)
+    total_spent = Column(Float, default=0.0, nullable=False)
+
+    last_booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="SET NULL"))
+    latest_active_booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="SET NULL"))
+
+    most_used_hall_id = Column(Integer, ForeignKey("halls.id", ondelete="SET NULL"))
+    most_used_hall_count = Column(Integer, default=0, nullable=False)
+
+
+class UserHallUsage(Base):
+    __tablename__ = "user_hall_usage"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    hall_id = Column(Integer, ForeignKey("halls.id", ondelete="CASCADE"), primary_key=True)
+    bookings = Column(Integer, default=0, nullable=False)
+
+
+#  ADMIN STAT COUNTERS
+# Running totals kept by app/stats.py and reconciled periodically.
+class StatCounter(Base):
+    __tablename__ = "stat_counters"
+
+    name = Column(String(64), primary_key=True)
+    value = Column(Float, default=0.0, nullable=False)
+
 
 #  EVENTS
 class Event(Base):
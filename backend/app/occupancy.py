@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app import models
+from app.availability import ACTIVE_STATUSES
+from app.response_cache import response_cache
+
+
+SLOT = timedelta(hours=1)
+
+
+def calendar_namespace(hall_id: int) -> str:
+    return f"calendar:{hall_id}"
+
+
+def invalidate_calendar(*hall_ids: int):
+    """Drop cached calendars after bookings of these halls change."""
+    response_cache.invalidate(*(calendar_namespace(h) for h in hall_ids))
+
+
+def month_bounds(month: str):
+    year, mon = (int(part) for part in month.split("-"))
+    start = datetime(year, mon, 1)
+    end = datetime(year + mon // 12, mon % 12 + 1, 1)
+    return start, end
+
+
+def occupied_statement(hall_id: int, start: datetime, end: datetime):
+    # bounded to the range so ix_bookings_hall_status_time does the work
+    Booking = models.Booking
+    return (
+        select(Booking.start_time, Booking.end_time)
+        .where(
+            Booking.hall_id == hall_id,
+            Booking.status.in_(ACTIVE_STATUSES),
+            Booking.start_time < end,
+            Booking.end_time > start,
+        )
+        .order_by(Booking.start_time)
+    )
+
+
+def occupied_runs(rows, start: datetime, end: datetime):
+    """Merge bookings into [first_slot, length] runs of hour slots.
+
+    A slot is occupied if any booking overlaps part of that hour.
+    """
+    total = (end - start) // SLOT
+    runs = []
+    for booking_start, booking_end in sorted(rows):
+        first = max(0, (booking_start - start) // SLOT)
+        last = min(total, -((start - booking_end) // SLOT))
+        if last <= first:
+            continue
+        if runs and first <= runs[-1][0] + runs[-1][1]:
+            runs[-1][1] = max(runs[-1][1], last - runs[-1][0])
+        else:
+            runs.append([first, last - first])
+    return runs
+
+
+def runs_to_bitmap(runs, slots: int) -> str:
+    """Hex bitmap of `slots` bits, slot 0 being the most significant bit."""
+    digits = (slots + 3) // 4
+    bits = 0
+    for first, length in runs:
+        bits |= ((1 << length) - 1) << (digits * 4 - first - length)
+    return f"{bits:0{digits}x}"
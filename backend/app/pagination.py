@@ -0,0 +1,86 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Generic, List, Optional, TypeVar
+import json
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class PageParams:
+    """Query parameters shared by every paginated list endpoint."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def _encode(value):
+    return {"dt": value.isoformat()} if isinstance(value, datetime) else value
+
+
+def _decode(value):
+    return datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([_encode(v) for v in values]).encode()
+    return urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = [_decode(v) for v in json.loads(urlsafe_b64decode(padded))]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return tuple(values)
+
+
+def keyset(stmt, columns, page: PageParams, descending: bool = False):
+    """Apply cursor filter, ordering and limit to a Query or select().
+
+    One extra row is fetched so `build_page` can tell if there is a next page.
+    """
+    if page.cursor:
+        values = decode_cursor(page.cursor, len(columns))
+        key = columns[0] if len(columns) == 1 else tuple_(*columns)
+        bound = values[0] if len(columns) == 1 else tuple_(*values)
+        stmt = stmt.filter(key < bound if descending else key > bound)
+
+    order = [c.desc() if descending else c.asc() for c in columns]
+    return stmt.order_by(*order).limit(page.limit + 1)
+
+
+def build_page(rows, page: PageParams, key, serialize=None) -> dict:
+    """Trim the look-ahead row and wrap rows in the list envelope.
+
+    `key` maps a row to the values of the keyset columns.
+    """
+    rows = list(rows)
+    has_more = len(rows) > page.limit
+    rows = rows[:page.limit]
+
+    return {
+        "items": [serialize(r) for r in rows] if serialize else rows,
+        "next_cursor": encode_cursor(key(rows[-1])) if has_more else None,
+    }
@@ -0,0 +1,49 @@
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+
+MAX_OCCURRENCES = 200
+
+
+def _add_months(start: datetime, months: int):
+    month_index = start.month - 1 + months
+    year, month = start.year + month_index // 12, month_index % 12 + 1
+    if start.day > monthrange(year, month)[1]:
+        # like RRULE BYMONTHDAY, months without that day are skipped
+        return None
+    return start.replace(year=year, month=month)
+
+
+def expand_occurrences(start: datetime, freq: str, interval: int, until: date):
+    """Yield occurrence start times from `start` up to and including `until`.
+
+    `freq` is "weekly" or "monthly"; occurrences come out in order.
+    """
+    step = 0
+    while True:
+        try:
+            if freq == "weekly":
+                occurrence = start + timedelta(weeks=interval * step)
+            else:
+                occurrence = _add_months(start, interval * step)
+        except (OverflowError, ValueError):
+            # past datetime.max, so past any `until` as well
+            return
+        step += 1
+
+        if occurrence is None:
+            continue
+        if occurrence.date() > until:
+            return
+
+        yield occurrence
+
+
+def bounded_occurrences(start: datetime, freq: str, interval: int, until: date):
+    """The rule's occurrences, or None if it has more than MAX_OCCURRENCES.
+
+    Expansion stops one past the cap, so far-off `until` dates cost nothing.
+    """
+    occurrences = list(islice(expand_occurrences(start, freq, interval, until), MAX_OCCURRENCES + 1))
+    return None if len(occurrences) > MAX_OCCURRENCES else occurrences
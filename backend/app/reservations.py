@@ -0,0 +1,185 @@
+from contextlib import contextmanager
+from collections import defaultdict
+from datetime import datetime
+from heapq import heappop, heappush
+from itertools import count
+import threading
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app import models
+from app.availability import ACTIVE_STATUSES
+
+
+_hall_locks = defaultdict(threading.Lock)
+_registry_lock = threading.Lock()
+
+
+def _local_locks(hall_ids):
+    with _registry_lock:
+        return [_hall_locks[h] for h in hall_ids]
+
+
+def _lock_in_database(db: Session, hall_ids):
+    conn = db.connection()
+
+    if conn.dialect.name == "sqlite":
+        # SQLite only takes the write lock at the first INSERT, after the
+        # overlap SELECT has already run; BEGIN IMMEDIATE takes it up front
+        # so reservations from other workers queue behind busy_timeout.
+        if not conn.connection.dbapi_connection.in_transaction:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        return
+
+    (
+        db.query(models.Hall.id)
+        .filter(models.Hall.id.in_(hall_ids))
+        .order_by(models.Hall.id)
+        .with_for_update()
+        .all()
+    )
+
+
+@contextmanager
+def lock_halls(db: Session, hall_ids):
+    """Serialize reservations for the given halls until the block exits.
+
+    Holds an in-process lock per hall plus a database write lock, so the
+    overlap check and the INSERT inside the block cannot interleave with
+    another reservation. Anything not committed is rolled back.
+    """
+    hall_ids = sorted(set(hall_ids))
+    locks = _local_locks(hall_ids)
+
+    for lock in locks:
+        lock.acquire()
+    try:
+        _lock_in_database(db, hall_ids)
+        yield
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        for lock in reversed(locks):
+            lock.release()
+
+
+def find_overlap(db: Session, hall_id: int, start: datetime, end: datetime):
+    return (
+        db.query(models.Booking)
+        .filter(
+            models.Booking.hall_id == hall_id,
+            models.Booking.status.in_(ACTIVE_STATUSES),
+            models.Booking.start_time < end,
+            models.Booking.end_time > start,
+        )
+        .first()
+    )
+
+
+def load_active_bookings(db: Session, ranges):
+    """Active bookings overlapping any (hall_id, start, end) range, in one query."""
+    ranges = list(ranges)
+    if not ranges:
+        return []
+    return (
+        db.query(models.Booking)
+        .filter(
+            models.Booking.status.in_(ACTIVE_STATUSES),
+            or_(*[
+                and_(
+                    models.Booking.hall_id == hall_id,
+                    models.Booking.start_time < end,
+                    models.Booking.end_time > start,
+                )
+                for hall_id, start, end in ranges
+            ]),
+        )
+        .all()
+    )
+
+
+def sweep_conflicts(intervals):
+    """Overlapping pairs among (hall_id, start, end, tag) intervals.
+
+    One pass in (hall, start) order with a heap of intervals still open,
+    instead of an overlap query per interval. Returns (earlier_tag, tag)
+    pairs.
+    """
+    pairs = []
+    open_intervals = []
+    current_hall = None
+    seq = count()
+
+    for hall_id, start, end, tag in sorted(intervals, key=lambda i: (i[0], i[1])):
+        if hall_id != current_hall:
+            current_hall, open_intervals = hall_id, []
+        while open_intervals and open_intervals[0][0] <= start:
+            heappop(open_intervals)
+        for _, _, other in open_intervals:
+            pairs.append((other, tag))
+        heappush(open_intervals, (end, next(seq), tag))
+
+    return pairs
+
+
+def find_conflicts(requested, existing, label: str):
+    """Conflict report for requested (hall_id, start, end) intervals.
+
+    One sweep covers clashes with the `existing` bookings and among the
+    requests themselves; entries are keyed by the request's position under
+    `label`.
+    """
+    intervals = [(h, s, e, (label, i)) for i, (h, s, e) in enumerate(requested)]
+    intervals += [(b.hall_id, b.start_time, b.end_time, ("booking", b.id)) for b in existing]
+
+    conflicts = {}
+    for a, b in sweep_conflicts(intervals):
+        for mine, other in ((a, b), (b, a)):
+            if mine[0] == label:
+                key = "booking_id" if other[0] == "booking" else label
+                conflicts.setdefault(mine[1], []).append({key: other[1]})
+
+    return [
+        {
+            label: i,
+            "hall_id": requested[i][0],
+            "start_time": requested[i][1].isoformat(),
+            "end_time": requested[i][2].isoformat(),
+            "conflicts_with": conflicts[i],
+        }
+        for i in sorted(conflicts)
+    ]
+
+
+def reactivation_conflicts(db: Session, bookings):
+    """Ids of cancelled bookings that would overlap if made active again.
+
+    Checks against active bookings and among `bookings` themselves; call
+    under lock_halls for their halls.
+    """
+    ranges = [(b.hall_id, b.start_time, b.end_time) for b in bookings if b.start_time and b.end_time]
+    intervals = [(b.hall_id, b.start_time, b.end_time, ("reactivate", b.id)) for b in bookings if b.start_time and b.end_time]
+    intervals += [
+        (b.hall_id, b.start_time, b.end_time, ("booking", b.id))
+        for b in load_active_bookings(db, ranges)
+    ]
+    blocked = set()
+    for a, b in sweep_conflicts(intervals):
+        blocked.update(tag[1] for tag in (a, b) if tag[0] == "reactivate")
+    return blocked
+
+
+BOOKING_RESULT_FIELDS = (
+    "booking_ref", "hall_id", "start_time", "end_time",
+    "amount", "tax", "service_fee", "total_price", "hold_expires_at",
+)
+
+
+def booking_results(indexed_bookings, label: str):
+    # read everything back before commit expires the objects
+    return [
+        {label: i, "booking_id": b.id, **{f: getattr(b, f) for f in BOOKING_RESULT_FIELDS}}
+        for i, b in indexed_bookings
+    ]
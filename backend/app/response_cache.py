@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from hashlib import sha256
+from importlib import import_module
+import os, threading, time
+
+from fastapi import Request, Response
+
+
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "2048"))
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "60"))
+# optional "package.module:ClassName" of a backend with the same interface
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND")
+
+
+class InMemoryBackend:
+    """Per-process LRU with TTL. Other backends need get/set/incr/counter."""
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: int):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+
+def _load_backend():
+    if not RESPONSE_CACHE_BACKEND:
+        return InMemoryBackend()
+    module, _, name = RESPONSE_CACHE_BACKEND.partition(":")
+    return getattr(import_module(module), name)()
+
+
+class ResponseCache:
+    """Caches serialized JSON bodies of public GET endpoints.
+
+    Keys are namespace + path + sorted query string. Writes invalidate a
+    whole namespace by bumping its generation, which is part of every key,
+    so stale entries are never read again and simply age out.
+    """
+
+    def __init__(self, backend=None, ttl: int = RESPONSE_CACHE_TTL, max_age: int = RESPONSE_CACHE_MAX_AGE):
+        self.backend = backend or _load_backend()
+        self.ttl = ttl
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def _key(self, namespace: str, request: Request) -> str:
+        generation = self.backend.counter(f"gen:{namespace}")
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        return f"{namespace}:{generation}:{request.url.path}?{query}"
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    async def respond(self, request: Request, namespace: str, schema, build, cache_control: str = None) -> Response:
+        """Serve from cache or `await build()`, validated through `schema`.
+
+        `cache_control` overrides the default public max-age, e.g. "no-cache"
+        for data a client must see right after its own write.
+        """
+        key = self._key(namespace, request)
+        cached = self.backend.get(key)
+
+        if cached is None:
+            self._count("misses")
+            payload = await build()
+            body = schema.model_validate(payload, from_attributes=True).model_dump_json().encode()
+            cached = (body, f'"{sha256(body).hexdigest()[:32]}"')
+            self.backend.set(key, cached, self.ttl)
+        else:
+            self._count("hits")
+
+        body, etag = cached
+        headers = {"ETag": etag, "Cache-Control": cache_control or f"public, max-age={self.max_age}"}
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+            self._count("not_modified")
+            return Response(status_code=304, headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            self.backend.incr(f"gen:{namespace}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "not_modified": self.not_modified}
+
+
+response_cache = ResponseCache()
@@ -1,10 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import update
+from datetime import datetime
+import csv, io, json
 
-from app.database import get_db
-from app import models, schemas
+from app.database import get_db, pool_stats, SessionLocal
+from app.pagination import PageParams, keyset, build_page
+from app import models, schemas, stats
 from app.routers.auth import get_current_active_user
+from app.session_cache import session_cache
+from app.password_hashing import password_hasher
+from app.session_reaper import session_reaper
+from app.booking_holds import hold_releaser
+from app.signed_tokens import revocation_list
+from app.response_cache import response_cache
+from app.google_places import google_places
+from app.availability import availability_index
+from app.reservations import lock_halls, reactivation_conflicts
+from app.occupancy import invalidate_calendar
+from app.user_summary import record_booking_status_changed, record_bulk_status_change, forget_users_of_hall
+from app.hall_import import import_halls
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -20,39 +36,149 @@ def admin_only(user: models.User = Depends(get_current_active_user)):
 @router.get("/stats")
 def get_stats(db: Session = Depends(get_db), user=Depends(admin_only)):
 
-    total_users = db.query(models.User).count()
-    total_bookings = db.query(models.Booking).count()
-    total_halls = db.query(models.Hall).count()
-
-    revenue = (
-        db.query(func.sum(models.Booking.total_price))
-        .filter(models.Booking.status == "confirmed")
-        .scalar()
-    ) or 0
+    counters = stats.read_counters(db)
 
     return {
-        "total_users": total_users,
-        "total_bookings": total_bookings,
-        "total_halls": total_halls,
-        "total_revenue": float(revenue)
+        "total_users": int(counters.get("users", 0)),
+        "total_bookings": int(counters.get("bookings", 0)),
+        "total_halls": int(counters.get("halls", 0)),
+        "total_revenue": float(counters.get("revenue", 0)),
+        "bookings_by_status": {
+            status: int(counters.get(f"bookings:{status}", 0))
+            for status in stats.BOOKING_STATUSES
+        },
     }
 
 
+# RECONCILE STATS
+@router.post("/stats/reconcile")
+def reconcile_stats(db: Session = Depends(get_db), user=Depends(admin_only)):
+    return stats.reconcile(db)
+
+
 # ALL BOOKINGS
 @router.get("/bookings")
-def get_bookings(limit: int = 100, db: Session = Depends(get_db), user=Depends(admin_only)):
+def get_bookings(page: PageParams = Depends(), db: Session = Depends(get_db), user=Depends(admin_only)):
 
-    bookings = db.query(models.Booking).limit(limit).all()
+    query = keyset(
+        db.query(models.Booking)
+        .options(joinedload(models.Booking.user), joinedload(models.Booking.hall)),
+        [models.Booking.created_at, models.Booking.id],
+        page,
+        descending=True,
+    )
 
-    return [{
+    return build_page(query.all(), page, key=lambda b: (b.created_at, b.id), serialize=lambda b: {
         "id": b.id,
+        "booking_ref": b.booking_ref,
         "user_name": b.user.full_name,
         "hall_name": b.hall.name,
         "guests": b.guests,
         "start_time": b.start_time,
         "status": b.status,
         "total_price": b.total_price
-    } for b in bookings]
+    })
+
+
+# STREAMING EXPORTS
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _stream_rows(build_query, fields, fmt):
+    # Uses its own session: the request-scoped one may be closed before
+    # the response body has been fully streamed.
+    db = SessionLocal()
+    try:
+        rows = (
+            build_query(db)
+            .execution_options(stream_results=True)
+            .yield_per(EXPORT_BATCH_SIZE)
+        )
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(fields)
+
+        for i, row in enumerate(rows, 1):
+            values = [_export_value(v) for v in row]
+            if fmt == "csv":
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(fields, values))) + "\n")
+
+            if i % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+def _export_response(build_query, fields, fmt, name):
+    return StreamingResponse(
+        _stream_rows(build_query, fields, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+BOOKING_EXPORT_FIELDS = [
+    "id", "booking_ref", "user_name", "user_email", "hall_name",
+    "start_time", "end_time", "guests", "status", "total_price", "created_at",
+]
+
+
+@router.get("/bookings/export")
+def export_bookings(
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    user=Depends(admin_only),
+):
+    def build_query(db):
+        return (
+            db.query(
+                models.Booking.id,
+                models.Booking.booking_ref,
+                models.User.full_name,
+                models.User.email,
+                models.Hall.name,
+                models.Booking.start_time,
+                models.Booking.end_time,
+                models.Booking.guests,
+                models.Booking.status,
+                models.Booking.total_price,
+                models.Booking.created_at,
+            )
+            .outerjoin(models.User, models.User.id == models.Booking.user_id)
+            .outerjoin(models.Hall, models.Hall.id == models.Booking.hall_id)
+            .order_by(models.Booking.id)
+        )
+
+    return _export_response(build_query, BOOKING_EXPORT_FIELDS, fmt, "bookings")
+
+
+USER_EXPORT_FIELDS = ["id", "name", "email", "is_admin"]
+
+
+@router.get("/users/export")
+def export_users(
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    user=Depends(admin_only),
+):
+    def build_query(db):
+        return (
+            db.query(models.User.id, models.User.full_name, models.User.email, models.User.is_admin)
+            .order_by(models.User.id)
+        )
+
+    return _export_response(build_query, USER_EXPORT_FIELDS, fmt, "users")
 
 
 # UPDATE BOOKING
@@ -71,16 +197,130 @@ def update_booking(
     if action not in ["confirm", "cancel"]:
         raise HTTPException(status_code=400, detail="Invalid action")
 
-    booking.status = "confirmed" if action == "confirm" else "cancelled"
-    db.commit()
+    # the slot of a cancelled booking may have been rebooked since
+    with lock_halls(db, [booking.hall_id]):
+        db.refresh(booking)
+        if action == "confirm" and booking.status == "cancelled" and reactivation_conflicts(db, [booking]):
+            raise HTTPException(status_code=400, detail="Time slot not available")
+
+        old_status = booking.status
+        booking.status = "confirmed" if action == "confirm" else "cancelled"
+        record_booking_status_changed(db, booking)
+        stats.booking_status_changed(db, booking, old_status)
+        db.commit()
+    availability_index.invalidate(booking.hall_id)
+    invalidate_calendar(booking.hall_id)
 
     return {"message": f"Booking {booking.status}"}
 
 
+BULK_ACTION_LIMIT = 1000
+
+
+@router.post("/bookings/bulk")
+def bulk_update_bookings(
+    payload: schemas.BulkBookingAction,
+    db: Session = Depends(get_db),
+    user=Depends(admin_only)
+):
+    Booking = models.Booking
+    new_status = "confirmed" if payload.action == "confirm" else "cancelled"
+    columns = (Booking.id, Booking.user_id, Booking.hall_id, Booking.status,
+               Booking.start_time, Booking.end_time, Booking.total_price)
+
+    if payload.booking_ids:
+        requested = list(dict.fromkeys(payload.booking_ids))
+        ids = requested
+        has_more = False
+    else:
+        # rows already in the target status are left out, so repeated
+        # calls move through the matches instead of re-reading them
+        filters = [Booking.status != new_status]
+        if payload.hall_id is not None:
+            filters.append(Booking.hall_id == payload.hall_id)
+        if payload.status:
+            filters.append(Booking.status == payload.status)
+        if payload.start_from:
+            filters.append(Booking.start_time >= payload.start_from)
+        if payload.start_to:
+            filters.append(Booking.start_time < payload.start_to)
+        if len(filters) == 1:
+            raise HTTPException(status_code=400, detail="Provide booking_ids or a filter")
+        # confirming by filter only picks up pending rows unless cancelled
+        # ones are asked for by status
+        if new_status == "confirmed" and not payload.status:
+            filters.append(Booking.status == "pending")
+        ids = [
+            row[0] for row in
+            db.query(Booking.id).filter(*filters).order_by(Booking.id).limit(BULK_ACTION_LIMIT + 1)
+        ]
+        has_more = len(ids) > BULK_ACTION_LIMIT
+        ids = requested = ids[:BULK_ACTION_LIMIT]
+
+    hall_ids = {row[0] for row in db.query(Booking.hall_id).filter(Booking.id.in_(ids)).distinct()}
+
+    with lock_halls(db, hall_ids):
+        found = {row.id: row for row in db.query(*columns).filter(Booking.id.in_(ids))}
+
+        blocked = set()
+        if new_status == "confirmed":
+            blocked = reactivation_conflicts(db, [r for r in found.values() if r.status == "cancelled"])
+
+        by_status = {}
+        for row in found.values():
+            if row.status != new_status and row.id not in blocked:
+                by_status.setdefault(row.status, []).append(row.id)
+
+        # one UPDATE per old status, so RETURNING tells exactly which rows
+        # moved from which status
+        changed = []
+        for old_status, group in by_status.items():
+            for row in db.execute(
+                update(Booking)
+                .where(Booking.id.in_(group), Booking.status == old_status)
+                .values(status=new_status)
+                .returning(Booking.id, Booking.user_id, Booking.hall_id, Booking.total_price),
+                execution_options={"synchronize_session": False},
+            ):
+                changed.append((old_status, row))
+
+        stats.bookings_status_changed(db, [(old, row.total_price) for old, row in changed], new_status)
+        record_bulk_status_change(db, {row.user_id for _, row in changed})
+        db.commit()
+
+    touched = {row.hall_id for _, row in changed}
+    for hall_id in touched:
+        availability_index.invalidate(hall_id)
+    invalidate_calendar(*touched)
+
+    updated = {row.id: old for old, row in changed}
+    results = []
+    for booking_id in requested:
+        row = found.get(booking_id)
+        if row is None:
+            results.append({"id": booking_id, "outcome": "not_found"})
+        elif booking_id in updated:
+            results.append({"id": booking_id, "outcome": "updated", "from": updated[booking_id], "status": new_status})
+        elif booking_id in blocked:
+            results.append({"id": booking_id, "outcome": "conflict", "status": row.status})
+        elif row.status == new_status:
+            results.append({"id": booking_id, "outcome": "unchanged", "status": new_status})
+        else:
+            # changed by someone else between the read and the UPDATE
+            results.append({"id": booking_id, "outcome": "skipped"})
+
+    return {
+        "updated": len(changed),
+        "results": results,
+        "has_more": has_more,
+    }
+
+
 #  GET HALLS
 @router.get("/halls")
-def get_halls(db: Session = Depends(get_db), user=Depends(admin_only)):
-    return db.query(models.Hall).all()
+def get_halls(page: PageParams = Depends(), db: Session = Depends(get_db), user=Depends(admin_only)):
+    query = keyset(db.query(models.Hall), [models.Hall.id], page)
+    return build_page(query.all(), page, key=lambda h: (h.id,))
 
 
 #  ADD HALL
@@ -92,11 +332,37 @@ def add_hall(
 ):
     new_hall = models.Hall(**data.dict())
     db.add(new_hall)
+    stats.bump(db, halls=1)
     db.commit()
     db.refresh(new_hall)
+    response_cache.invalidate("halls")
     return new_hall
 
 
+# BULK IMPORT HALLS
+@router.post("/halls/import")
+def bulk_import_halls(
+    file: UploadFile = File(...),
+    fmt: str = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+    user=Depends(admin_only)
+):
+    if fmt is None:
+        name = (file.filename or "").lower()
+        if name.endswith(".csv"):
+            fmt = "csv"
+        elif name.endswith((".ndjson", ".jsonl")):
+            fmt = "ndjson"
+        else:
+            raise HTTPException(status_code=400, detail="Specify format=csv or format=ndjson")
+
+    report = import_halls(db, file.file, fmt)
+    if report["inserted"]:
+        response_cache.invalidate("halls")
+
+    return report
+
+
 # DELETE HALL
 @router.delete("/halls/{hall_id}")
 def delete_hall(
@@ -109,20 +375,40 @@ def delete_hall(
     if not hall:
         raise HTTPException(status_code=404, detail="Hall not found")
 
+    forget_users_of_hall(db, hall_id)
+    stats.hall_removed(db, hall_id)
     db.delete(hall)
     db.commit()
+    availability_index.invalidate(hall_id)
+    invalidate_calendar(hall_id)
+    response_cache.invalidate("halls", "events")
 
     return {"message": "Hall deleted"}
 
 
 #  GET ALL USERS
 @router.get("/users")
-def get_users(db: Session = Depends(get_db), user=Depends(admin_only)):
-    users = db.query(models.User).all()
-    
-    return [{
+def get_users(page: PageParams = Depends(), db: Session = Depends(get_db), user=Depends(admin_only)):
+    query = keyset(db.query(models.User), [models.User.id], page)
+
+    return build_page(query.all(), page, key=lambda u: (u.id,), serialize=lambda u: {
         "id": u.id,
         "name": u.full_name,
         "email": u.email,
         "is_admin": u.is_admin
-    } for u in users]
+    })
+
+
+#  RUNTIME METRICS
+@router.get("/metrics")
+def get_metrics(db: Session = Depends(get_db), user=Depends(admin_only)):
+    return {
+        "sessions": session_reaper.stats(db),
+        "booking_holds": hold_releaser.stats(db),
+        "session_cache": session_cache.stats(),
+        "token_revocations": revocation_list.stats(),
+        "db_pool": pool_stats(),
+        "password_hashing": password_hasher.stats(),
+        "response_cache": response_cache.stats(),
+        "google_places": google_places.stats(),
+    }
@@ -1,28 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Cookie, Request, Form
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 import secrets, hashlib
 
-from app import models, schemas
-from app.database import get_db
+from app import models, schemas, stats
+from app.database import get_db, get_async_db
+from app.session_cache import session_cache
+from app.password_hashing import password_hasher
+from app.session_reaper import enforce_session_cap
+from app.signed_tokens import (
+    SIGNED_TOKENS_ENABLED, revocation_list, decode_token, user_from_claims, session_cookie_value,
+)
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+def generate_session_token() -> str:
+    return secrets.token_urlsafe(32)
 
 
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+async def _start_session(db: AsyncSession, user_id: int):
+    # commit the new session and drop the user's oldest ones over the cap
+    await db.flush()
+    evicted = await db.run_sync(lambda s: enforce_session_cap(s, user_id))
+    await db.commit()
+    for token in evicted:
+        session_cache.invalidate(token)
+        revocation_list.revoke(token)
 
 
-def generate_session_token() -> str:
-    return secrets.token_urlsafe(32)
+async def _rehash_if_needed(user: models.User, password: str):
+    # upgrade hashes made with an older BCRYPT_ROUNDS; saved with the
+    # caller's commit
+    if password_hasher.needs_update(user.hashed_password):
+        user.hashed_password = await password_hasher.hash(password)
+        password_hasher.record_rehash()
 
 
 #  COOKIE + HEADER AUTH
@@ -41,20 +55,34 @@ def get_current_active_user(
     if not token:
         raise HTTPException(status_code=401, detail="Not logged in")
 
-    session = db.query(models.Session).filter(
-        models.Session.token == token,
-        models.Session.expiration > datetime.utcnow()
-    ).first()
+    if SIGNED_TOKENS_ENABLED:
+        # signature, expiry and the revocation list are all checked in
+        # memory; the user comes from the token claims
+        claims = decode_token(token)
+        if not claims or revocation_list.is_revoked(claims):
+            raise HTTPException(status_code=401, detail="Invalid or expired session")
+        return db.merge(user_from_claims(claims), load=False)
+
+    cached = session_cache.get(token)
+    if cached is not None:
+        # attach the snapshot to this request's session without a SELECT
+        return db.merge(cached, load=False)
+
+    row = (
+        db.query(models.User, models.Session.expiration)
+        .join(models.Session, models.Session.user_id == models.User.id)
+        .filter(
+            models.Session.token == token,
+            models.Session.expiration > datetime.utcnow()
+        )
+        .first()
+    )
 
-    if not session:
+    if not row:
         raise HTTPException(status_code=401, detail="Invalid or expired session")
 
-    user = db.query(models.User).filter(
-        models.User.id == session.user_id
-    ).first()
-
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
+    user, expiration = row
+    session_cache.put(token, user, expiration)
 
     return user
 
@@ -74,21 +102,22 @@ def get_current_admin_user(
 #  SIGNUP 
 
 @router.post("/signup", response_model=schemas.User, status_code=201)
-def signup(user_data: schemas.UserCreate, db: Session = Depends(get_db)):
+async def signup(user_data: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
 
-    if db.query(models.User).filter(models.User.email == user_data.email).first():
+    if await db.scalar(select(models.User.id).filter(models.User.email == user_data.email)):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     new_user = models.User(
         full_name=user_data.full_name,
         email=user_data.email,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await password_hasher.hash(user_data.password),
         is_admin=False
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.run_sync(lambda s: stats.bump(s, users=1))
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
 
@@ -96,28 +125,31 @@ def signup(user_data: schemas.UserCreate, db: Session = Depends(get_db)):
 #  USER + ADMIN LOGIN 
 
 @router.post("/login")
-def login(data: schemas.Login, response: Response, db: Session = Depends(get_db)):
+async def login(data: schemas.Login, response: Response, db: AsyncSession = Depends(get_async_db)):
 
-    user = db.query(models.User).filter(models.User.email == data.email).first()
+    user = await db.scalar(select(models.User).filter(models.User.email == data.email))
 
-    if not user or not verify_password(data.password, user.hashed_password):
+    if not user or not await password_hasher.verify(data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
+    await _rehash_if_needed(user, data.password)
+
     session_token = generate_session_token()
+    expiration = datetime.utcnow() + timedelta(days=7)
 
     db.add(models.Session(
         token=session_token,
         user_id=user.id,
-        expiration=datetime.utcnow() + timedelta(days=7)
+        expiration=expiration
     ))
-    db.commit()
+    await _start_session(db, user.id)
 
     response.set_cookie(
         key="session_token",
-        value=session_token,
+        value=session_cookie_value(user, session_token, expiration),
         httponly=False,  
         samesite="lax",
         secure=False,
@@ -140,52 +172,58 @@ def login(data: schemas.Login, response: Response, db: Session = Depends(get_db)
 # ------------------ DEFAULT ADMIN LOGIN ------------------
 
 @router.post("/admin/login")
-def admin_login(
+async def admin_login(
     email: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
 
     # Create forced admin if not exists
     if email == "admin@gmail.com" and password == "admin123":
-        user = db.query(models.User).filter(models.User.email == email).first()
+        user = await db.scalar(select(models.User).filter(models.User.email == email))
 
         if not user:
             user = models.User(
                 full_name="System Admin",
                 email=email,
-                hashed_password=hash_password(password),
+                hashed_password=await password_hasher.hash(password),
                 is_admin=True
             )
             db.add(user)
-            db.commit()
+            await db.run_sync(lambda s: stats.bump(s, users=1))
+            await db.commit()
         elif not user.is_admin:
             user.is_admin = True
-            user.hashed_password = hash_password(password)
-            db.commit()
+            user.hashed_password = await password_hasher.hash(password)
+            await db.commit()
+            session_cache.invalidate_user(user.id)
+            revocation_list.revoke_user(user.id)
 
-    user = db.query(models.User).filter(models.User.email == email).first()
+    user = await db.scalar(select(models.User).filter(models.User.email == email))
 
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await password_hasher.verify(password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     if not user.is_admin:
         raise HTTPException(status_code=403, detail="Admin only")
 
+    await _rehash_if_needed(user, password)
+
     session_token = generate_session_token()
+    expiration = datetime.utcnow() + timedelta(days=1)
 
     db.add(models.Session(
         token=session_token,
         user_id=user.id,
-        expiration=datetime.utcnow() + timedelta(days=1)
+        expiration=expiration
     ))
-    db.commit()
+    await _start_session(db, user.id)
 
     response = Response()
 
     response.set_cookie(
         key="session_token",
-        value=session_token,
+        value=session_cookie_value(user, session_token, expiration),
         httponly=False,
         samesite="lax",
         secure=False,
@@ -213,11 +251,19 @@ def logout(
     session_token: str = Cookie(None)
 ):
 
+    if session_token and SIGNED_TOKENS_ENABLED:
+        claims = decode_token(session_token, verify_exp=False)
+        if claims:
+            revocation_list.revoke(claims["jti"], until=claims["exp"])
+        # the sessions row is keyed by the token id
+        session_token = claims["jti"] if claims else None
+
     if session_token:
         db.query(models.Session).filter(
             models.Session.token == session_token
         ).delete()
         db.commit()
+        session_cache.invalidate(session_token)
 
     response.delete_cookie("session_token")
 
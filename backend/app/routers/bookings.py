@@ -1,11 +1,26 @@
 # app/routers/bookings.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+import uuid
 
-from app.database import get_db
-from app import models, schemas
+from app.database import get_db, get_async_db
+from app import models, schemas, stats
+from app.availability import availability_index
+from app.booking_holds import hold_expiry
+from app.occupancy import (
+    SLOT, calendar_namespace, invalidate_calendar, month_bounds,
+    occupied_runs, occupied_statement, runs_to_bitmap,
+)
+from app.recurrence import MAX_OCCURRENCES, bounded_occurrences
+from app.response_cache import response_cache
+from app.reservations import (
+    lock_halls, find_overlap, load_active_bookings, find_conflicts, booking_results,
+)
+from app.user_summary import record_booking_created, record_booking_status_changed
 from app.routers.auth import get_current_active_user  # your auth dependency
 from app.models import Booking, Hall, User
 
@@ -14,6 +29,23 @@ router = APIRouter(prefix="/bookings", tags=["Bookings"])
 GST_RATE = 0.18
 SERVICE_FEE = 300
 
+
+def price_booking(hall: Hall, duration: int) -> dict:
+    amount = hall.price_per_hour * duration
+    tax = amount * GST_RATE
+    service_fee = SERVICE_FEE
+    return {
+        "amount": amount,
+        "tax": tax,
+        "service_fee": service_fee,
+        "total_price": amount + tax + service_fee,
+    }
+
+
+def new_booking_ref() -> str:
+    return f"BK-{uuid.uuid4().hex[:8].upper()}"
+
+
 @router.post("/create")
 def create_booking(payload: schemas.BookingCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
     hall = db.query(Hall).filter(Hall.id == payload.hall_id).first()
@@ -25,52 +57,171 @@ def create_booking(payload: schemas.BookingCreate, db: Session = Depends(get_db)
     
     end_dt = start_dt + timedelta(hours=payload.duration)
 
-    # simple double-booking check
-    overlapping = db.query(Booking).filter(
-        Booking.hall_id == hall.id,
-        Booking.status.in_(["confirmed", "pending"]),
-        Booking.start_time < end_dt,
-        Booking.end_time > start_dt
-    ).first()
-    if overlapping:
-        raise HTTPException(status_code=400, detail="Time slot not available")
-
-    amount = hall.price_per_hour * payload.duration
-    tax = amount * GST_RATE
-    service_fee = SERVICE_FEE
-    total_price = amount + tax + service_fee
-
-    # Generate Booking Ref
-    import uuid
-    booking_ref = f"BK-{uuid.uuid4().hex[:8].upper()}"
-
     booking = Booking(
         user_id=current_user.id,
         hall_id=hall.id,
-        booking_ref=booking_ref,
+        booking_ref=new_booking_ref(),
         start_time=start_dt,
         end_time=end_dt,
         guests=payload.guests,
         status="pending",
         note=payload.note,
-        amount=amount,
-        tax=tax,
-        service_fee=service_fee,
-        total_price=total_price
+        hold_expires_at=hold_expiry(current_user, payload.hold),
+        **price_booking(hall, payload.duration)
     )
 
-    db.add(booking)
-    db.commit()
+    # check and insert under the hall lock so concurrent requests for the
+    # same slot cannot both pass the overlap query
+    with lock_halls(db, [hall.id]):
+        if find_overlap(db, hall.id, start_dt, end_dt):
+            raise HTTPException(status_code=400, detail="Time slot not available")
+
+        db.add(booking)
+        record_booking_created(db, booking)
+        stats.booking_created(db, booking)
+        db.commit()
+
     db.refresh(booking)
+    availability_index.add(booking)
+    invalidate_calendar(booking.hall_id)
+
+    return {
+        "success": True,
+        "booking_id": booking.id,
+        "booking_ref": booking.booking_ref,
+        "hold_expires_at": booking.hold_expires_at,
+    }
+
+@router.post("/batch")
+def create_batch_booking(payload: schemas.BatchBookingCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+    hall_ids = {slot.hall_id for slot in payload.slots}
+    halls = {h.id: h for h in db.query(Hall).filter(Hall.id.in_(hall_ids))}
+    missing = sorted(hall_ids - halls.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail={"message": "Hall not found", "hall_ids": missing})
+
+    slots = [
+        (slot.hall_id, slot.date, slot.date + timedelta(hours=slot.duration))
+        for slot in payload.slots
+    ]
+
+    with lock_halls(db, hall_ids):
+        conflicts = find_conflicts(slots, load_active_bookings(db, slots), "slot")
+        if conflicts:
+            raise HTTPException(status_code=400, detail={
+                "message": "Time slot not available",
+                "conflicts": conflicts,
+            })
 
-    return {"success": True, "booking_id": booking.id, "booking_ref": booking.booking_ref}
+        bookings = []
+        for slot, (hall_id, start_dt, end_dt) in zip(payload.slots, slots):
+            booking = Booking(
+                user_id=current_user.id,
+                hall_id=hall_id,
+                booking_ref=new_booking_ref(),
+                start_time=start_dt,
+                end_time=end_dt,
+                guests=slot.guests,
+                status="pending",
+                note=slot.note,
+                hold_expires_at=hold_expiry(current_user, slot.hold),
+                **price_booking(halls[hall_id], slot.duration)
+            )
+            db.add(booking)
+            record_booking_created(db, booking)
+            stats.booking_created(db, booking)
+            bookings.append(booking)
+
+        results = booking_results(enumerate(bookings), "slot")
+        db.commit()
+
+    for hall_id in hall_ids:
+        availability_index.invalidate(hall_id)
+    invalidate_calendar(*hall_ids)
+
+    return {
+        "success": True,
+        "total_price": sum(r["total_price"] for r in results),
+        "bookings": results,
+    }
+
+@router.post("/recurring")
+def create_recurring_booking(payload: schemas.RecurringBookingCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+    hall = db.query(Hall).filter(Hall.id == payload.hall_id).first()
+    if not hall:
+        raise HTTPException(status_code=404, detail="Hall not found")
+    if payload.until < payload.date.date():
+        raise HTTPException(status_code=400, detail="Recurrence ends before the first booking")
+
+    starts = bounded_occurrences(payload.date, payload.freq, payload.interval, payload.until)
+    if starts is None:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Recurrence has more than {MAX_OCCURRENCES} occurrences; use an earlier end date",
+        )
+
+    length = timedelta(hours=payload.duration)
+    occurrences = [(start_dt, start_dt + length) for start_dt in starts]
+
+    with lock_halls(db, [hall.id]):
+        # one range query over the whole series, then one sweep over it
+        existing = load_active_bookings(db, [(hall.id, occurrences[0][0], occurrences[-1][1])])
+
+        requested = [(hall.id, s, e) for s, e in occurrences]
+        skipped = find_conflicts(requested, existing, "occurrence")
+        conflicts = {c["occurrence"] for c in skipped}
+        if skipped and not payload.skip_conflicts:
+            raise HTTPException(status_code=400, detail={
+                "message": "Time slot not available",
+                "conflicts": skipped,
+            })
+
+        pricing = price_booking(hall, payload.duration)
+        bookings = []
+        for i, (start_dt, end_dt) in enumerate(occurrences):
+            if i in conflicts:
+                continue
+            booking = Booking(
+                user_id=current_user.id,
+                hall_id=hall.id,
+                booking_ref=new_booking_ref(),
+                start_time=start_dt,
+                end_time=end_dt,
+                guests=payload.guests,
+                status="pending",
+                note=payload.note,
+                hold_expires_at=hold_expiry(current_user, payload.hold),
+                **pricing
+            )
+            db.add(booking)
+            record_booking_created(db, booking)
+            stats.booking_created(db, booking)
+            bookings.append((i, booking))
+
+        results = booking_results(bookings, "occurrence")
+        db.commit()
+
+    availability_index.invalidate(hall.id)
+    invalidate_calendar(hall.id)
+
+    return {
+        "success": True,
+        "total_price": sum(r["total_price"] for r in results),
+        "bookings": results,
+        "skipped": skipped,
+    }
 
 @router.get("/me", response_model=List[dict])
 def my_bookings(db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
-    bookings = db.query(Booking).filter(Booking.user_id == current_user.id).order_by(Booking.created_at.desc()).all()
+    rows = (
+        db.query(Booking, Hall)
+        .outerjoin(Hall, Hall.id == Booking.hall_id)
+        .filter(Booking.user_id == current_user.id)
+        .order_by(Booking.created_at.desc())
+        .all()
+    )
     result = []
-    for b in bookings:
-        hall = db.query(Hall).filter(Hall.id == b.hall_id).first()
+    for b, hall in rows:
         result.append({
             "id": b.id,
             "booking_ref": b.booking_ref,
@@ -86,10 +237,15 @@ def my_bookings(db: Session = Depends(get_db), current_user: User = Depends(get_
 
 @router.get("/{booking_id}")
 def get_booking(booking_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
-    booking = db.query(Booking).filter(Booking.id == booking_id, Booking.user_id == current_user.id).first()
-    if not booking:
+    row = (
+        db.query(Booking, Hall)
+        .outerjoin(Hall, Hall.id == Booking.hall_id)
+        .filter(Booking.id == booking_id, Booking.user_id == current_user.id)
+        .first()
+    )
+    if not row:
         raise HTTPException(status_code=404, detail="Booking not found")
-    hall = db.query(Hall).filter(Hall.id == booking.hall_id).first()
+    booking, hall = row
     return {
         "id": booking.id,
         "booking_ref": booking.booking_ref,
@@ -124,12 +280,79 @@ def cancel_booking(booking_id: int, db: Session = Depends(get_db), current_user:
         raise HTTPException(status_code=404, detail="Booking not found")
     if booking.status == "cancelled":
         raise HTTPException(status_code=400, detail="Already cancelled")
+    old_status = booking.status
     booking.status = "cancelled"
+    record_booking_status_changed(db, booking)
+    stats.booking_status_changed(db, booking, old_status)
     db.commit()
+    availability_index.discard(booking)
+    invalidate_calendar(booking.hall_id)
     return {"success": True, "message": "Booking cancelled"}
 
 
 @router.get("/hall/{hall_id}")
-def get_bookings_by_hall(hall_id: int, db: Session = Depends(get_db)):
-    bookings = db.query(Booking).filter(Booking.hall_id == hall_id).all()
-    return bookings
+async def get_bookings_by_hall(hall_id: int, db: AsyncSession = Depends(get_async_db)):
+    result = await db.scalars(select(Booking).filter(Booking.hall_id == hall_id))
+    return result.all()
+
+
+@router.get("/hall/{hall_id}/calendar", response_model=schemas.HallCalendar)
+async def hall_calendar(
+    hall_id: int,
+    request: Request,
+    month: str = Query(..., pattern=r"^(19|2\d)\d{2}-(0[1-9]|1[0-2])$"),
+    encoding: str = Query("bitmap", pattern="^(bitmap|runs)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    async def build():
+        if not await db.get(Hall, hall_id):
+            raise HTTPException(status_code=404, detail="Hall not found")
+
+        start, end = month_bounds(month)
+        rows = (await db.execute(occupied_statement(hall_id, start, end))).all()
+        runs = occupied_runs(rows, start, end)
+        slots = (end - start) // SLOT
+        return {
+            "hall_id": hall_id,
+            "month": month,
+            "start": start,
+            "slots": slots,
+            "occupied_hours": sum(length for _, length in runs),
+            "bitmap": runs_to_bitmap(runs, slots) if encoding == "bitmap" else None,
+            "runs": runs if encoding == "runs" else None,
+        }
+
+    # revalidate every time: the generation bump on booking writes only
+    # helps if the browser asks, and the calendar refetches right after one
+    return await response_cache.respond(
+        request, calendar_namespace(hall_id), schemas.HallCalendar, build, cache_control="no-cache"
+    )
+
+
+@router.get("/hall/{hall_id}/availability", response_model=schemas.HallAvailability)
+def hall_availability(
+    hall_id: int,
+    day: date = Query(..., alias="date"),
+    start: Optional[datetime] = None,
+    duration: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+):
+    if not db.query(Hall.id).filter(Hall.id == hall_id).first():
+        raise HTTPException(status_code=404, detail="Hall not found")
+
+    day_start = datetime.combine(day, time.min)
+    free = availability_index.free_slots(db, hall_id, day_start)
+
+    slot_free = None
+    if start is not None and duration is not None:
+        start = schemas.naive_utc(start)
+        slot_free = availability_index.is_free(
+            db, hall_id, start, start + timedelta(hours=duration)
+        )
+
+    return {
+        "hall_id": hall_id,
+        "date": day,
+        "free_slots": [{"start": s, "end": e} for s, e in free],
+        "slot_free": slot_free,
+    }
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.database import get_db
+from app.pagination import Page, PageParams, keyset, build_page
 
 router = APIRouter(prefix="/contact", tags=["Contact"])
 
@@ -23,6 +24,12 @@ def create_message(msg: schemas.ContactCreate, db: Session = Depends(get_db)):
     return new_msg
 
 
-@router.get("/", response_model=list[schemas.Contact])
-def get_all(db: Session = Depends(get_db)):
-    return db.query(models.ContactMessage).all()
+@router.get("/", response_model=Page[schemas.Contact])
+def get_all(db: Session = Depends(get_db), page: PageParams = Depends()):
+    query = keyset(
+        db.query(models.ContactMessage),
+        [models.ContactMessage.created_at, models.ContactMessage.id],
+        page,
+        descending=True,
+    )
+    return build_page(query.all(), page, key=lambda m: (m.created_at, m.id))
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from datetime import datetime
 from calendar import month_name
+from typing import Optional
 
 from app import models, schemas
 from app.database import get_db
 from app.routers.auth import get_current_active_user
+from app.user_summary import get_user_summary
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -17,66 +18,7 @@ def user_summary(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
-    bookings = (
-        db.query(models.Booking, models.Hall)
-        .join(models.Hall, models.Booking.hall_id == models.Hall.id)
-        .filter(models.Booking.user_id == current_user.id)
-        .order_by(models.Booking.start_time.desc())
-        .all()
-    )
-
-    total_bookings = len(bookings)
-    now = datetime.utcnow()
-
-    def format_booking(booking: models.Booking, hall: models.Hall):
-        return {
-            "id": booking.id,
-            "hall_name": hall.name if hall else "Unknown",
-            "start_time": booking.start_time,
-            "end_time": booking.end_time,
-            "status": booking.status,
-            "total_price": booking.total_price,
-        }
-
-    if not bookings:
-        return {
-            "total_bookings": 0,
-            "total_spent": 0,
-            "last_booking": None,
-            "upcoming_booking": None,
-            "most_used_hall": None,
-        }
-
-    # Total spent
-    total_spent = sum((b.total_price or 0) for b, _ in bookings)
-
-    # Last booking
-    last_booking = format_booking(bookings[0][0], bookings[0][1])
-
-    # Upcoming booking
-    upcoming_booking = None
-    for booking, hall in bookings:
-        if booking.start_time and booking.start_time > now and booking.status != "cancelled":
-            upcoming_booking = format_booking(booking, hall)
-            break
-
-    # Most used hall
-    most_used = (
-        db.query(models.Hall.name, func.count(models.Booking.id))
-        .join(models.Booking)
-        .filter(models.Booking.user_id == current_user.id)
-        .group_by(models.Hall.name)
-        .order_by(func.count(models.Booking.id).desc())
-        .first()
-    )
-
-    return {
-        "total_bookings": total_bookings,
-        "total_spent": round(total_spent, 2),
-        "last_booking": last_booking,
-        "upcoming_booking": upcoming_booking,
-        "most_used_hall": most_used[0] if most_used else None,
-    }
+    return get_user_summary(db, current_user.id)
 
 
 #  MONTHLY BOOKINGS CHART 
@@ -125,31 +67,39 @@ def hall_usage_chart(
 
 
 #  REVENUE CHART 
+def revenue_by_month(db: Session, user_id: int, year: Optional[int] = None):
+    year_col = func.extract("year", models.Booking.start_time).label("year")
+    month_col = func.extract("month", models.Booking.start_time).label("month")
+
+    query = (
+        db.query(
+            year_col,
+            month_col,
+            func.coalesce(func.sum(models.Booking.total_price), 0).label("total")
+        )
+        .filter(
+            models.Booking.user_id == user_id,
+            models.Booking.start_time.isnot(None)
+        )
+    )
+
+    if year is not None:
+        query = query.filter(year_col == year)
+
+    return query.group_by(year_col, month_col).order_by(year_col, month_col).all()
+
+
 @router.get("/charts/revenue", response_model=schemas.RevenueChart)
 def revenue_chart(
+    year: Optional[int] = Query(None, ge=1970, le=9999),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
-    rows = (
-        db.query(models.Booking)
-        .filter(models.Booking.user_id == current_user.id)
-        .all()
-    )
-
-    revenue_per_month = {}
-
-    for booking in rows:
-        if not booking.start_time:
-            continue
-
-        month_str = booking.start_time.strftime("%B")
-        revenue_per_month[month_str] = revenue_per_month.get(month_str, 0) + (
-            booking.total_price or 0
-        )
+    rows = revenue_by_month(db, current_user.id, year)
 
     data = [
-        {"month": m, "total_revenue": round(v, 2)}
-        for m, v in revenue_per_month.items()
+        {"year": int(y), "month": month_name[int(m)], "total_revenue": round(t, 2)}
+        for y, m, t in rows
     ]
 
     return {"data": data}
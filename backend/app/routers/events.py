@@ -1,20 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import models, schemas
-from app.database import get_db
+from app.database import get_db, get_async_db
+from app.pagination import Page, PageParams, keyset, build_page
+from app.response_cache import response_cache
 
 from app.routers.auth import get_current_admin_user
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
-@router.get("/", response_model=List[schemas.Event])
-def list_events(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+@router.get("/", response_model=Page[schemas.Event])
+async def list_events(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    page: PageParams = Depends()
 ):
-    return db.query(models.Event).offset(skip).limit(limit).all()
+    async def build():
+        stmt = keyset(select(models.Event), [models.Event.id], page)
+        result = await db.scalars(stmt)
+        return build_page(result.all(), page, key=lambda e: (e.id,))
+
+    return await response_cache.respond(request, "events", Page[schemas.Event], build)
 
 @router.post("/", response_model=schemas.Event, status_code=201)
 def create_event(
@@ -26,4 +34,5 @@ def create_event(
     db.add(db_event)
     db.commit()
     db.refresh(db_event)
+    response_cache.invalidate("events")
     return db_event
\ No newline at end of file
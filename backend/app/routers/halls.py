@@ -1,35 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
-import os, requests
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from app import models, schemas
-from app.database import get_db
+from app import models, schemas, stats
+from app.database import get_db, get_async_db
+from app.pagination import Page, PageParams, keyset, build_page
+from app.response_cache import response_cache
+from app.geo import nearby_candidates, rank_by_distance
+from app.hall_search import HallFilters, facet_statement, build_facets
+from app.google_places import google_places, GOOGLE_PLACES_API_KEY
 
 from app.routers.auth import get_current_admin_user
 
 router = APIRouter(prefix="/halls", tags=["Halls"])
 
-GOOGLE_PLACES_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
+#  GET ALL HALLS 
+class HallPage(Page[schemas.Hall]):
+    facets: Optional[schemas.HallFacets] = None
 
 
-#  GET ALL HALLS 
-@router.get("/", response_model=List[schemas.Hall])
-def get_halls(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+@router.get("/", response_model=HallPage)
+async def get_halls(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    page: PageParams = Depends(),
+    filters: HallFilters = Depends()
 ):
-    return db.query(models.Hall).offset(skip).limit(limit).all()
+    columns, descending = filters.sort_columns
+
+    async def build():
+        stmt = keyset(filters.apply(select(models.Hall)), columns, page, descending=descending)
+        result = await db.scalars(stmt)
+        body = build_page(
+            result.all(), page,
+            key=lambda h: tuple(getattr(h, c.key) for c in columns),
+        )
+        if filters.facets:
+            body["facets"] = build_facets((await db.execute(facet_statement(filters))).all())
+        return body
+
+    # availability depends on bookings, which do not invalidate "halls"
+    if filters.depends_on_bookings:
+        return HallPage.model_validate(await build(), from_attributes=True)
+
+    return await response_cache.respond(request, "halls", HallPage, build)
 
 
 #  GET SINGLE HALL 
 @router.get("/{hall_id}", response_model=schemas.Hall)
-def get_hall_by_id(hall_id: int, db: Session = Depends(get_db)):
-    hall = db.query(models.Hall).filter(models.Hall.id == hall_id).first()
-    if not hall:
-        raise HTTPException(404, detail="Hall not found")
-    return hall
+async def get_hall_by_id(hall_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        hall = await db.get(models.Hall, hall_id)
+        if not hall:
+            raise HTTPException(404, detail="Hall not found")
+        return hall
+
+    return await response_cache.respond(request, "halls", schemas.Hall, build)
 
 
 # = CREATE HALL (ADMIN ONLY) 
@@ -43,15 +71,35 @@ def create_hall(
     new_hall = models.Hall(**hall.dict())
 
     db.add(new_hall)
+    stats.bump(db, halls=1)
     db.commit()
     db.refresh(new_hall)
+    response_cache.invalidate("halls")
 
     return new_hall
 
 
+#  LOCAL HALLS BY DISTANCE 
+@router.get("/search/nearby", response_model=List[schemas.HallNearby])
+async def search_nearby_halls(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10, gt=0, le=500),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+):
+    halls = await db.scalars(nearby_candidates(lat, lng, radius_km))
+    ranked = rank_by_distance(halls.all(), lat, lng, radius_km, limit)
+
+    return [
+        {**schemas.Hall.model_validate(hall).model_dump(), "distance_km": round(distance, 3)}
+        for distance, hall in ranked
+    ]
+
+
 # GOOGLE LIVE HALLS 
 @router.get("/google/nearby")
-def google_nearby_halls(
+async def google_nearby_halls(
     city: str = Query(None),
     lat: float = Query(None),
     lng: float = Query(None),
@@ -62,13 +110,7 @@ def google_nearby_halls(
 
     # Convert city to lat/lng
     if city:
-        geo_url = "https://maps.googleapis.com/maps/api/geocode/json"
-        geo_params = {
-            "address": f"{city}, India",
-            "key": GOOGLE_PLACES_API_KEY,
-        }
-
-        geo_res = requests.get(geo_url, params=geo_params).json()
+        geo_res = await google_places.geocode(f"{city}, India")
 
         if geo_res.get("status") != "OK":
             raise HTTPException(404, detail="City not found")
@@ -80,15 +122,7 @@ def google_nearby_halls(
     if not lat or not lng:
         raise HTTPException(400, detail="City or lat/lng is required")
 
-    url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
-    params = {
-        "location": f"{lat},{lng}",
-        "radius": radius,
-        "keyword": "banquet hall wedding event venue",
-        "key": GOOGLE_PLACES_API_KEY,
-    }
-
-    data = requests.get(url, params=params).json()
+    data = await google_places.nearby(lat, lng, radius, "banquet hall wedding event venue")
 
     if data.get("status") not in ["OK", "ZERO_RESULTS"]:
         raise HTTPException(502, detail=data.get("error_message", "Google API error"))
@@ -160,7 +194,9 @@ def seed_halls(db: Session = Depends(get_db)):
         exists = db.query(models.Hall).filter(models.Hall.name == h["name"]).first()
         if not exists:
             db.add(models.Hall(**h))
+            stats.bump(db, halls=1)
 
     db.commit()
+    response_cache.invalidate("halls")
 
     return {"message": " Dummy halls added"}
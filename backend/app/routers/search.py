@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.database import get_async_db
+from app.fulltext import query_terms, hall_search_statement, event_search_statement
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+#  HALL + EVENT SEARCH
+@router.get("/", response_model=schemas.SearchResults)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: str = Query("all", pattern="^(all|halls|events)$"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+):
+    terms = query_terms(q)
+    results = {"halls": [], "events": []}
+
+    if not terms:
+        return results
+
+    if type in ("all", "halls"):
+        rows = await db.execute(hall_search_statement(terms, limit))
+        results["halls"] = [
+            {"id": r.id, "name": r.name, "city": r.city, "score": r.score}
+            for r in rows
+        ]
+
+    if type in ("all", "events"):
+        rows = await db.execute(event_search_statement(terms, limit))
+        results["events"] = [
+            {"id": r.id, "title": r.title, "date": r.date, "score": r.score}
+            for r in rows
+        ]
+
+    return results
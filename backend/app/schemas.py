@@ -1,6 +1,13 @@
-from typing import List, Optional
-from pydantic import BaseModel, EmailStr, Field
-from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from datetime import date, datetime, timezone
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Offset-aware datetimes as naive UTC, the way bookings are stored."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 # USER 
@@ -59,6 +66,20 @@ class Hall(HallBase):
         from_attributes = True
 
 
+class HallNearby(Hall):
+    distance_km: float
+
+
+class PriceBucket(BaseModel):
+    label: str
+    count: int
+
+
+class HallFacets(BaseModel):
+    cities: Dict[str, int]
+    price_buckets: List[PriceBucket]
+
+
 #  GOOGLE HALL 
 
 class GoogleHall(BaseModel):
@@ -79,6 +100,25 @@ class BookingCreate(BaseModel):
     duration: int = Field(..., ge=1)
     guests: int = Field(..., ge=1)
     note: Optional[str] = None
+    # customer bookings are always holds; lets an admin hold their own too
+    hold: bool = False
+
+    @field_validator("date")
+    @classmethod
+    def _naive_date(cls, value):
+        return naive_utc(value)
+
+
+class BatchBookingCreate(BaseModel):
+    slots: List[BookingCreate] = Field(..., min_length=1, max_length=100)
+
+
+class RecurringBookingCreate(BookingCreate):
+    freq: str = Field(..., pattern="^(weekly|monthly)$")
+    interval: int = Field(1, ge=1, le=52)
+    until: date
+    # book the free occurrences instead of rejecting the whole series
+    skip_conflicts: bool = False
 
 
 class Booking(BaseModel):
@@ -100,6 +140,30 @@ class Booking(BaseModel):
         from_attributes = True
 
 
+class AvailabilitySlot(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class HallAvailability(BaseModel):
+    hall_id: int
+    date: date
+    free_slots: List[AvailabilitySlot]
+    slot_free: Optional[bool] = None
+
+
+class HallCalendar(BaseModel):
+    hall_id: int
+    month: str
+    start: datetime
+    slots: int  # one per hour from `start`
+    occupied_hours: int
+    # hex, most significant bit = first hour
+    bitmap: Optional[str] = None
+    # [first_slot, length] runs of occupied hours
+    runs: Optional[List[List[int]]] = None
+
+
 #  CONTACT 
 
 class ContactCreate(BaseModel):
@@ -139,6 +203,27 @@ class Event(EventBase):
         from_attributes = True
 
 
+#  SEARCH 
+
+class HallHit(BaseModel):
+    id: int
+    name: str
+    city: Optional[str] = None
+    score: float
+
+
+class EventHit(BaseModel):
+    id: int
+    title: str
+    date: Optional[datetime] = None
+    score: float
+
+
+class SearchResults(BaseModel):
+    halls: List[HallHit]
+    events: List[EventHit]
+
+
 #  DASHBOARD 
 class BookingSummary(BaseModel):
     id: int
@@ -180,6 +265,21 @@ class AdminBookingItem(BaseModel):
         from_attributes = True
 
 
+class BulkBookingAction(BaseModel):
+    action: str = Field(..., pattern="^(confirm|cancel)$")
+    booking_ids: Optional[List[int]] = Field(None, min_length=1, max_length=1000)
+    # used when booking_ids is not given
+    hall_id: Optional[int] = None
+    status: Optional[str] = Field(None, pattern="^(pending|confirmed|cancelled)$")
+    start_from: Optional[datetime] = None
+    start_to: Optional[datetime] = None
+
+    @field_validator("start_from", "start_to")
+    @classmethod
+    def _naive_range(cls, value):
+        return naive_utc(value)
+
+
 # CHARTS 
 
 class MonthlyBookingItem(BaseModel):
@@ -201,6 +301,7 @@ class HallUsageChart(BaseModel):
 
 
 class MonthlyRevenueItem(BaseModel):
+    year: Optional[int] = None
     month: str
     total_revenue: float
 
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from datetime import datetime
+import os, threading, time
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app import models
+
+
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+SESSION_CACHE_TTL = int(os.getenv("SESSION_CACHE_TTL", "60"))
+
+
+class SessionCache:
+    """Bounded LRU of session token -> detached User snapshot.
+
+    Entries live for at most `ttl` seconds and never past the expiration
+    of the session row they were loaded from.
+    """
+
+    def __init__(self, maxsize: int = SESSION_CACHE_SIZE, ttl: int = SESSION_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[token]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def put(self, token: str, user: models.User, session_expiration: datetime):
+        if self.maxsize <= 0:
+            return
+
+        # Keep a private copy so the cached object is never bound to (or
+        # expired by) the request session that loaded it.
+        snapshot = models.User(
+            id=user.id,
+            full_name=user.full_name,
+            email=user.email,
+            hashed_password=user.hashed_password,
+            is_admin=user.is_admin,
+        )
+        make_transient_to_detached(snapshot)
+
+        remaining = (session_expiration - datetime.utcnow()).total_seconds()
+        expires_at = time.monotonic() + min(self.ttl, remaining)
+
+        with self._lock:
+            self._entries[token] = (snapshot, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, token: str):
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            stale = [t for t, (u, _) in self._entries.items() if u.id == user_id]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+session_cache = SessionCache()
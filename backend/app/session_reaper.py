@@ -0,0 +1,107 @@
+from datetime import datetime
+import os, threading, time
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+SESSION_REAP_INTERVAL = int(os.getenv("SESSION_REAP_INTERVAL", "300"))
+SESSION_REAP_BATCH = int(os.getenv("SESSION_REAP_BATCH", "1000"))
+MAX_SESSIONS_PER_USER = int(os.getenv("MAX_SESSIONS_PER_USER", "10"))
+
+
+class SessionReaper:
+    """Deletes expired rows from `sessions` in small batches.
+
+    Each batch is its own transaction so the reaper never holds the write
+    lock for long on SQLite.
+    """
+
+    def __init__(self, batch_size: int = SESSION_REAP_BATCH):
+        self.batch_size = batch_size
+        self.runs = 0
+        self.reaped_total = 0
+        self.capped_total = 0
+        self.last_run_at = None
+        self.last_reaped = 0
+        self.last_duration = 0.0
+        self._lock = threading.Lock()
+
+    def reap(self, db: Session) -> int:
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        reaped = 0
+
+        while True:
+            ids = [
+                row[0] for row in
+                db.query(models.Session.id)
+                .filter(models.Session.expiration <= now)
+                .limit(self.batch_size)
+                .all()
+            ]
+            if not ids:
+                break
+
+            db.query(models.Session).filter(models.Session.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            reaped += len(ids)
+
+            if len(ids) < self.batch_size:
+                break
+
+        with self._lock:
+            self.runs += 1
+            self.reaped_total += reaped
+            self.last_run_at = now
+            self.last_reaped = reaped
+            self.last_duration = time.perf_counter() - started
+        return reaped
+
+    def record_capped(self, count: int):
+        with self._lock:
+            self.capped_total += count
+
+    def stats(self, db: Session) -> dict:
+        total = db.query(func.count(models.Session.id)).scalar()
+        expired = (
+            db.query(func.count(models.Session.id))
+            .filter(models.Session.expiration <= datetime.utcnow())
+            .scalar()
+        )
+        with self._lock:
+            return {
+                "table_size": total,
+                "expired_pending": expired,
+                "max_per_user": MAX_SESSIONS_PER_USER,
+                "reaper_runs": self.runs,
+                "reaped_total": self.reaped_total,
+                "capped_total": self.capped_total,
+                "last_run_at": self.last_run_at,
+                "last_reaped": self.last_reaped,
+                "last_reap_rate_per_sec": round(self.last_reaped / self.last_duration, 1) if self.last_duration else 0.0,
+            }
+
+
+def enforce_session_cap(db: Session, user_id: int, keep: int = MAX_SESSIONS_PER_USER):
+    """Delete a user's sessions beyond the newest `keep`; returns their tokens."""
+    # newest by issue order, not expiration: a just-issued 1-day admin
+    # session must not rank below older 7-day sessions
+    stale = (
+        db.query(models.Session.id, models.Session.token)
+        .filter(models.Session.user_id == user_id)
+        .order_by(models.Session.id.desc())
+        .offset(keep)
+        .all()
+    )
+    if stale:
+        db.query(models.Session).filter(
+            models.Session.id.in_([row[0] for row in stale])
+        ).delete(synchronize_session=False)
+        session_reaper.record_capped(len(stale))
+    return [row[1] for row in stale]
+
+
+session_reaper = SessionReaper()
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+import os, threading, time
+
+from jose import JWTError, jwt
+from sqlalchemy.orm import make_transient_to_detached
+
+from app import models
+
+
+# "session" keeps the opaque token checked against the sessions table on
+# every request; "jwt" hands out a signed token carrying the user claims.
+AUTH_TOKEN_MODE = os.getenv("AUTH_TOKEN_MODE", "session")
+AUTH_SECRET_KEY = os.getenv("AUTH_SECRET_KEY")
+AUTH_TOKEN_ALGORITHM = os.getenv("AUTH_TOKEN_ALGORITHM", "HS256")
+
+SIGNED_TOKENS_ENABLED = AUTH_TOKEN_MODE == "jwt"
+
+if SIGNED_TOKENS_ENABLED and not AUTH_SECRET_KEY:
+    raise RuntimeError("AUTH_SECRET_KEY must be set when AUTH_TOKEN_MODE=jwt")
+
+# longest session lifetime handed out by login
+MAX_TOKEN_LIFETIME = timedelta(days=7)
+
+
+class RevocationList:
+    """In-memory deny list for signed tokens that have not expired yet.
+
+    Tokens are revoked by id (logout, session cap) or per user for
+    everything issued before a cutoff (role changes). Entries are dropped
+    once the token would have expired anyway, which keeps the list small.
+    Each worker holds its own list; the sessions table stays the durable
+    record.
+    """
+
+    def __init__(self):
+        self._tokens = {}
+        self._user_cutoffs = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float):
+        for jti in [j for j, until in self._tokens.items() if until <= now]:
+            del self._tokens[jti]
+        horizon = now - MAX_TOKEN_LIFETIME.total_seconds()
+        for user_id in [u for u, cutoff in self._user_cutoffs.items() if cutoff <= horizon]:
+            del self._user_cutoffs[user_id]
+
+    def revoke(self, jti: str, until: float = None):
+        now = time.time()
+        with self._lock:
+            self._tokens[jti] = until or now + MAX_TOKEN_LIFETIME.total_seconds()
+            self._prune(now)
+
+    def revoke_user(self, user_id: int):
+        with self._lock:
+            self._user_cutoffs[user_id] = time.time()
+
+    def is_revoked(self, claims: dict) -> bool:
+        with self._lock:
+            if claims["jti"] in self._tokens:
+                return True
+            cutoff = self._user_cutoffs.get(int(claims["sub"]))
+            return cutoff is not None and claims["iat"] < int(cutoff)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"revoked_tokens": len(self._tokens), "revoked_users": len(self._user_cutoffs)}
+
+
+revocation_list = RevocationList()
+
+
+def issue_token(user: models.User, session_token: str, expiration: datetime) -> str:
+    claims = {
+        "sub": str(user.id),
+        "jti": session_token,
+        "iat": datetime.utcnow(),
+        "exp": expiration,
+        "name": user.full_name,
+        "email": user.email,
+        "adm": bool(user.is_admin),
+    }
+    return jwt.encode(claims, AUTH_SECRET_KEY, algorithm=AUTH_TOKEN_ALGORITHM)
+
+
+def decode_token(token: str, verify_exp: bool = True):
+    try:
+        return jwt.decode(
+            token,
+            AUTH_SECRET_KEY,
+            algorithms=[AUTH_TOKEN_ALGORITHM],
+            options={"verify_exp": verify_exp},
+        )
+    except JWTError:
+        return None
+
+
+def user_from_claims(claims: dict) -> models.User:
+    user = models.User(
+        id=int(claims["sub"]),
+        full_name=claims["name"],
+        email=claims["email"],
+        is_admin=claims["adm"],
+    )
+    make_transient_to_detached(user)
+    return user
+
+
+def session_cookie_value(user: models.User, session_token: str, expiration: datetime) -> str:
+    if SIGNED_TOKENS_ENABLED:
+        return issue_token(user, session_token, expiration)
+    return session_token
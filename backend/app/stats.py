@@ -0,0 +1,136 @@
+import os
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.models import StatCounter
+
+
+STATS_RECONCILE_INTERVAL = int(os.getenv("STATS_RECONCILE_INTERVAL", "600"))
+
+BOOKING_STATUSES = ("pending", "confirmed", "cancelled")
+
+# Counter names: users, halls, bookings, bookings:<status>, revenue
+# (revenue is the total_price of confirmed bookings).
+
+
+def bump(db: Session, **deltas):
+    """Add deltas to counters inside the caller's transaction."""
+    for name, delta in deltas.items():
+        if delta:
+            _add(db, name, delta)
+
+
+def _add(db: Session, name: str, delta: float):
+    # counters that do not exist yet are created by the next reconcile
+    db.query(StatCounter).filter(StatCounter.name == name).update(
+        {StatCounter.value: StatCounter.value + delta}, synchronize_session=False
+    )
+
+
+def _booking_deltas(status: str, price: float, sign: int) -> dict:
+    deltas = {f"bookings:{status}": sign}
+    if status == "confirmed":
+        deltas["revenue"] = sign * (price or 0)
+    return deltas
+
+
+def booking_created(db: Session, booking: models.Booking):
+    for name, delta in _booking_deltas(booking.status, booking.total_price, 1).items():
+        _add(db, name, delta)
+    _add(db, "bookings", 1)
+
+
+def booking_status_changed(db: Session, booking: models.Booking, old_status: str):
+    if old_status == booking.status:
+        return
+    for name, delta in _booking_deltas(old_status, booking.total_price, -1).items():
+        _add(db, name, delta)
+    for name, delta in _booking_deltas(booking.status, booking.total_price, 1).items():
+        _add(db, name, delta)
+
+
+def bookings_status_changed(db: Session, changes, new_status: str):
+    """booking_status_changed for many rows; `changes` is (old_status, price) pairs."""
+    totals = {}
+    for old_status, price in changes:
+        if old_status == new_status:
+            continue
+        for sign, status in ((-1, old_status), (1, new_status)):
+            for name, delta in _booking_deltas(status, price, sign).items():
+                totals[name] = totals.get(name, 0) + delta
+    bump(db, **totals)
+
+
+def hall_removed(db: Session, hall_id: int):
+    """Account for a hall and its bookings about to be deleted."""
+    rows = (
+        db.query(models.Booking.status, func.count(models.Booking.id), func.sum(models.Booking.total_price))
+        .filter(models.Booking.hall_id == hall_id)
+        .group_by(models.Booking.status)
+        .all()
+    )
+    for status, count, total in rows:
+        _add(db, f"bookings:{status}", -count)
+        _add(db, "bookings", -count)
+        if status == "confirmed":
+            _add(db, "revenue", -(total or 0))
+    _add(db, "halls", -1)
+
+
+def compute_counters(db: Session) -> dict:
+    counters = {
+        "users": db.query(func.count(models.User.id)).scalar(),
+        "halls": db.query(func.count(models.Hall.id)).scalar(),
+        "bookings": 0,
+        "revenue": 0.0,
+    }
+    for status in BOOKING_STATUSES:
+        counters[f"bookings:{status}"] = 0
+
+    rows = (
+        db.query(models.Booking.status, func.count(models.Booking.id), func.sum(models.Booking.total_price))
+        .group_by(models.Booking.status)
+        .all()
+    )
+    for status, count, total in rows:
+        counters[f"bookings:{status}"] = count
+        counters["bookings"] += count
+        if status == "confirmed":
+            counters["revenue"] = float(total or 0)
+
+    return counters
+
+
+def _lock_counters(db: Session):
+    conn = db.connection()
+    if conn.dialect.name == "sqlite":
+        # pysqlite runs the recount SELECTs outside a transaction; take the
+        # write lock first so no counter update lands between recount and
+        # replacement
+        if not conn.connection.dbapi_connection.in_transaction:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+    else:
+        conn.exec_driver_sql(f"LOCK TABLE {StatCounter.__tablename__} IN EXCLUSIVE MODE")
+
+
+def reconcile(db: Session) -> dict:
+    """Recompute every counter from the base tables and store it.
+
+    Recount and replacement happen in one transaction that holds off
+    concurrent counter updates until it commits.
+    """
+    _lock_counters(db)
+    counters = compute_counters(db)
+    db.query(StatCounter).delete(synchronize_session=False)
+    db.add_all(StatCounter(name=name, value=value) for name, value in counters.items())
+    db.commit()
+    return counters
+
+
+def read_counters(db: Session) -> dict:
+    counters = {c.name: c.value for c in db.query(StatCounter).all()}
+    if not counters:
+        counters = reconcile(db)
+    return counters
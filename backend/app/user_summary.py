@@ -0,0 +1,186 @@
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.models import Booking, Hall, UserSummary, UserHallUsage
+
+
+# All writers run inside the caller's transaction and leave the commit to
+# it, so the summary always moves together with the booking rows.
+
+
+def _latest_booking_id(db: Session, user_id: int, active_only: bool = False):
+    # top-1 on ix_bookings_user_start
+    query = db.query(Booking.id).filter(Booking.user_id == user_id)
+    if active_only:
+        query = query.filter(Booking.status != "cancelled")
+    row = query.order_by(Booking.start_time.desc()).first()
+    return row[0] if row else None
+
+
+def _refresh_pointers(db: Session, user_id: int):
+    db.query(UserSummary).filter(UserSummary.user_id == user_id).update({
+        UserSummary.last_booking_id: _latest_booking_id(db, user_id),
+        UserSummary.latest_active_booking_id: _latest_booking_id(db, user_id, active_only=True),
+    }, synchronize_session=False)
+
+
+def _lock_summaries(db: Session):
+    conn = db.connection()
+    if conn.dialect.name == "sqlite":
+        # pysqlite runs the recount SELECTs outside a transaction; take the
+        # write lock first so no booking lands between recount and
+        # replacement. Writers under lock_halls already hold it.
+        if not conn.connection.dbapi_connection.in_transaction:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+    else:
+        conn.exec_driver_sql(f"LOCK TABLE {UserSummary.__tablename__} IN EXCLUSIVE MODE")
+
+
+def rebuild_user_summary(db: Session, user_id: int):
+    db.flush()
+    _lock_summaries(db)
+
+    total, spent = (
+        db.query(func.count(Booking.id), func.coalesce(func.sum(Booking.total_price), 0))
+        .filter(Booking.user_id == user_id)
+        .one()
+    )
+    usage = (
+        db.query(Booking.hall_id, func.count(Booking.id))
+        .filter(Booking.user_id == user_id, Booking.hall_id.isnot(None))
+        .group_by(Booking.hall_id)
+        .all()
+    )
+
+    db.query(UserHallUsage).filter(UserHallUsage.user_id == user_id).delete(synchronize_session=False)
+    db.query(UserSummary).filter(UserSummary.user_id == user_id).delete(synchronize_session=False)
+
+    db.add_all(UserHallUsage(user_id=user_id, hall_id=h, bookings=c) for h, c in usage)
+    top = max(usage, key=lambda u: u[1], default=(None, 0))
+
+    db.add(UserSummary(
+        user_id=user_id,
+        total_bookings=total,
+        total_spent=spent,
+        last_booking_id=_latest_booking_id(db, user_id),
+        latest_active_booking_id=_latest_booking_id(db, user_id, active_only=True),
+        most_used_hall_id=top[0],
+        most_used_hall_count=top[1],
+    ))
+    db.flush()
+
+
+def record_booking_created(db: Session, booking: Booking):
+    db.flush()
+    user_id = booking.user_id
+
+    if not db.query(UserSummary.user_id).filter(UserSummary.user_id == user_id).first():
+        rebuild_user_summary(db, user_id)
+        return
+
+    db.query(UserSummary).filter(UserSummary.user_id == user_id).update({
+        UserSummary.total_bookings: UserSummary.total_bookings + 1,
+        UserSummary.total_spent: UserSummary.total_spent + (booking.total_price or 0),
+    }, synchronize_session=False)
+
+    usage = db.query(UserHallUsage).filter(
+        UserHallUsage.user_id == user_id,
+        UserHallUsage.hall_id == booking.hall_id,
+    )
+    if not usage.update({UserHallUsage.bookings: UserHallUsage.bookings + 1}, synchronize_session=False):
+        db.add(UserHallUsage(user_id=user_id, hall_id=booking.hall_id, bookings=1))
+        db.flush()
+
+    count = usage.with_entities(UserHallUsage.bookings).scalar()
+    db.query(UserSummary).filter(
+        UserSummary.user_id == user_id,
+        UserSummary.most_used_hall_count < count,
+    ).update({
+        UserSummary.most_used_hall_id: booking.hall_id,
+        UserSummary.most_used_hall_count: count,
+    }, synchronize_session=False)
+
+    _refresh_pointers(db, user_id)
+
+
+def record_booking_status_changed(db: Session, booking: Booking):
+    # counts and spend include cancelled bookings; only the active pointer moves
+    db.flush()
+    if db.query(UserSummary.user_id).filter(UserSummary.user_id == booking.user_id).first():
+        _refresh_pointers(db, booking.user_id)
+
+
+def record_bulk_status_change(db: Session, user_ids):
+    """record_booking_status_changed for many bookings changed by one UPDATE."""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    summarized = db.query(UserSummary.user_id).filter(UserSummary.user_id.in_(user_ids))
+    for (user_id,) in summarized.all():
+        _refresh_pointers(db, user_id)
+
+
+def forget_users_of_hall(db: Session, hall_id: int):
+    """Drop summaries that count bookings of a hall about to be deleted."""
+    user_ids = db.query(Booking.user_id).filter(Booking.hall_id == hall_id).distinct()
+    db.query(UserSummary).filter(UserSummary.user_id.in_(user_ids.scalar_subquery())).delete(
+        synchronize_session=False
+    )
+    db.query(UserHallUsage).filter(UserHallUsage.hall_id == hall_id).delete(synchronize_session=False)
+
+
+def _format_booking(booking: Booking, hall: Hall):
+    return {
+        "id": booking.id,
+        "hall_name": hall.name if hall else "Unknown",
+        "start_time": booking.start_time,
+        "end_time": booking.end_time,
+        "status": booking.status,
+        "total_price": booking.total_price,
+    }
+
+
+def get_user_summary(db: Session, user_id: int) -> dict:
+    summary = db.get(UserSummary, user_id)
+    if summary is None:
+        rebuild_user_summary(db, user_id)
+        db.commit()
+        summary = db.get(UserSummary, user_id)
+
+    if not summary.total_bookings:
+        return {
+            "total_bookings": 0,
+            "total_spent": 0,
+            "last_booking": None,
+            "upcoming_booking": None,
+            "most_used_hall": None,
+        }
+
+    ids = {summary.last_booking_id, summary.latest_active_booking_id} - {None}
+    rows = {
+        b.id: (b, h)
+        for b, h in db.query(Booking, Hall)
+        .outerjoin(Hall, Hall.id == Booking.hall_id)
+        .filter(Booking.id.in_(ids))
+    }
+
+    last = rows.get(summary.last_booking_id)
+    latest_active = rows.get(summary.latest_active_booking_id)
+
+    # the latest non-cancelled booking is upcoming only while it is in the future
+    upcoming = None
+    if latest_active and latest_active[0].start_time and latest_active[0].start_time > datetime.utcnow():
+        upcoming = latest_active
+
+    most_used = db.get(models.Hall, summary.most_used_hall_id) if summary.most_used_hall_id else None
+
+    return {
+        "total_bookings": summary.total_bookings,
+        "total_spent": round(summary.total_spent, 2),
+        "last_booking": _format_booking(*last) if last else None,
+        "upcoming_booking": _format_booking(*upcoming) if upcoming else None,
+        "most_used_hall": most_used.name if most_used else None,
+    }
@@ -0,0 +1,52 @@
+"""
+Password hashing benchmark
+Reports bcrypt verifications per second (i.e. logins/second) on one thread
+and through the password hashing pool, normalised per core.
+
+Usage: python bench_password_hashing.py [verifications]
+"""
+import asyncio
+import os
+import sys
+import time
+
+from app.password_hashing import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, pwd_context, password_hasher
+
+PASSWORD = "correct horse battery staple"
+
+
+def single_thread(hashed, total):
+    started = time.perf_counter()
+    for _ in range(total):
+        pwd_context.verify(PASSWORD, hashed)
+    return total / (time.perf_counter() - started)
+
+
+async def pooled(hashed, total):
+    # stay within the pool's queue limit so nothing is rejected
+    batch = password_hasher.workers + password_hasher.max_queue
+    started = time.perf_counter()
+    done = 0
+    while done < total:
+        n = min(batch, total - done)
+        await asyncio.gather(*(password_hasher.verify(PASSWORD, hashed) for _ in range(n)))
+        done += n
+    return total / (time.perf_counter() - started)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    cores = os.cpu_count() or 1
+    hashed = pwd_context.hash(PASSWORD)
+
+    print(f"bcrypt rounds: {BCRYPT_ROUNDS}, pool workers: {PASSWORD_HASH_WORKERS}, cores: {cores}")
+
+    single = single_thread(hashed, total)
+    print(f" Single thread: {single:.1f} logins/s")
+
+    pool = asyncio.run(pooled(hashed, total))
+    print(f" Pool:          {pool:.1f} logins/s ({pool / min(cores, PASSWORD_HASH_WORKERS):.1f} per core)")
+
+
+if __name__ == "__main__":
+    main()
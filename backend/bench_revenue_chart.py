@@ -0,0 +1,94 @@
+"""
+Revenue chart benchmark
+Seeds a throwaway SQLite database with bookings for one user and times the
+old per-row Python summing against the GROUP BY query used by
+/dashboard/charts/revenue.
+
+Usage: python bench_revenue_chart.py [bookings]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "bench_revenue.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+
+from app.database import Base, engine, SessionLocal  # noqa: E402
+from app import models  # noqa: E402
+from app.routers.dashboard import revenue_by_month  # noqa: E402
+
+RUNS = 5
+
+
+def seed(total):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    user = models.User(full_name="Bench User", email="bench@example.com", hashed_password="x")
+    hall = models.Hall(name="Bench Hall", capacity=100, price_per_hour=1000)
+    db.add_all([user, hall])
+    db.commit()
+    # read before the final commit/close expire and detach the instances
+    user_id, hall_id = user.id, hall.id
+
+    base = datetime(2022, 1, 1)
+    rows = []
+    for i in range(total):
+        start = base + timedelta(hours=random.randint(0, 3 * 365 * 24))
+        rows.append({
+            "user_id": user_id,
+            "hall_id": hall_id,
+            "booking_ref": f"BK-{i:08d}",
+            "start_time": start,
+            "end_time": start + timedelta(hours=2),
+            "guests": 50,
+            "total_price": round(random.uniform(1000, 50000), 2),
+            "status": "confirmed",
+        })
+    db.execute(models.Booking.__table__.insert(), rows)
+    db.commit()
+    db.close()
+    return user_id
+
+
+def old_revenue(db, user_id):
+    revenue_per_month = {}
+    for booking in db.query(models.Booking).filter(models.Booking.user_id == user_id).all():
+        if not booking.start_time:
+            continue
+        month_str = booking.start_time.strftime("%B")
+        revenue_per_month[month_str] = revenue_per_month.get(month_str, 0) + (booking.total_price or 0)
+    return revenue_per_month
+
+
+def timed(fn, user_id):
+    best = None
+    for _ in range(RUNS):
+        db = SessionLocal()
+        started = time.perf_counter()
+        fn(db, user_id)
+        elapsed = time.perf_counter() - started
+        db.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print(f"Seeding {total} bookings into {DB_FILE}...")
+    user_id = seed(total)
+
+    old = timed(old_revenue, user_id)
+    new = timed(revenue_by_month, user_id)
+
+    print(f" Python sum over ORM rows: {old * 1000:.1f} ms")
+    print(f" SQL GROUP BY year/month:  {new * 1000:.1f} ms")
+    print(f" Speedup: {old / new:.1f}x (best of {RUNS})")
+
+
+if __name__ == "__main__":
+    main()
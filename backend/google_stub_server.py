@@ -0,0 +1,95 @@
+"""
+Local stand-in for the Google Geocode and Places APIs
+Serves canned responses so /halls/google/nearby can be exercised without
+a real key or network access.
+
+Usage:
+    python google_stub_server.py [port]
+    GOOGLE_MAPS_BASE_URL=http://127.0.0.1:8765 GOOGLE_PLACES_API_KEY=stub uvicorn app.main:app
+
+Set STUB_DELAY to add latency (seconds) for timeout and coalescing checks.
+GET /stats returns how many upstream calls the API actually made.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DELAY = float(os.getenv("STUB_DELAY", "0"))
+
+CITIES = {
+    "bhopal": (23.2599, 77.4126),
+    "pune": (18.5204, 73.8567),
+    "mumbai": (19.0760, 72.8777),
+    "jaipur": (26.9124, 75.7873),
+}
+
+calls = {"geocode": 0, "nearby": 0}
+calls_lock = threading.Lock()
+
+
+def geocode(params):
+    city = params.get("address", [""])[0].split(",")[0].strip().lower()
+    if city not in CITIES:
+        return {"status": "ZERO_RESULTS", "results": []}
+    lat, lng = CITIES[city]
+    return {"status": "OK", "results": [{"geometry": {"location": {"lat": lat, "lng": lng}}}]}
+
+
+def nearby(params):
+    lat, lng = (float(v) for v in params["location"][0].split(","))
+    return {
+        "status": "OK",
+        "results": [
+            {
+                "place_id": f"stub-{i}",
+                "name": f"Stub Banquet Hall {i}",
+                "vicinity": f"Stub Road {i}",
+                "rating": 4.0 + i / 10,
+                "geometry": {"location": {"lat": lat + i * 0.001, "lng": lng + i * 0.001}},
+            }
+            for i in range(5)
+        ],
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+
+        if url.path == "/stats":
+            with calls_lock:
+                return self._send(dict(calls))
+
+        if DELAY:
+            time.sleep(DELAY)
+
+        if url.path.endswith("/geocode/json"):
+            kind, body = "geocode", geocode(params)
+        elif url.path.endswith("/place/nearbysearch/json"):
+            kind, body = "nearby", nearby(params)
+        else:
+            self.send_error(404)
+            return
+
+        with calls_lock:
+            calls[kind] += 1
+        self._send(body)
+
+    def _send(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    print(f"Google stub listening on http://127.0.0.1:{port}")
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
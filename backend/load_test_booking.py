@@ -0,0 +1,80 @@
+"""
+Concurrent booking load test
+Fires N parallel /bookings/create calls for the same hall slot against a
+running API and checks that exactly one of them wins.
+
+Usage: python load_test_booking.py [parallel_requests] [hall_id]
+"""
+import os
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import httpx
+
+API_BASE = os.getenv("API_BASE", "http://127.0.0.1:8000")
+EMAIL = os.getenv("LOAD_TEST_EMAIL", "admin@gmail.com")
+PASSWORD = os.getenv("LOAD_TEST_PASSWORD", "admin123")
+
+
+def login(client):
+    res = client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+    res.raise_for_status()
+    return res.cookies["session_token"]
+
+
+def book(client, token, payload):
+    res = client.post(
+        "/bookings/create",
+        json=payload,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    return res.status_code
+
+
+def run(client, parallel, hall_id):
+    token = login(client)
+
+    # pick a random far-future slot so repeated runs do not collide
+    start = datetime(2099, 1, 1, 9) + timedelta(days=random.randint(0, 3000))
+    payload = {
+        "hall_id": hall_id,
+        "date": start.isoformat(),
+        "duration": 2,
+        "guests": 10,
+        "note": "load test",
+    }
+
+    print(f"Firing {parallel} parallel bookings for hall {hall_id} at {start}...")
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        return list(pool.map(lambda _: book(client, token, payload), range(parallel)))
+
+
+def main():
+    parallel = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    hall_id = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    # one client shared by all workers, with a connection per worker so
+    # the requests really are in flight together
+    limits = httpx.Limits(max_connections=parallel, max_keepalive_connections=parallel)
+    with httpx.Client(base_url=API_BASE, timeout=30.0, limits=limits) as client:
+        codes = run(client, parallel, hall_id)
+
+    won = codes.count(200)
+    rejected = codes.count(400)
+    other = len(codes) - won - rejected
+
+    print(f" Succeeded: {won}")
+    print(f" Rejected (slot taken): {rejected}")
+    print(f" Other errors: {other}")
+
+    if won == 1 and other == 0:
+        print(" PASS: exactly one booking won")
+    else:
+        print(" FAIL: expected exactly one winning booking")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
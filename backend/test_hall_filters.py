@@ -0,0 +1,77 @@
+"""
+Availability filter check for the hall catalog
+Seeds a throwaway SQLite database with two halls, books one of them from
+10:00 to 12:00 UTC, and queries GET /halls/ with naive, "Z" and "+05:30"
+ranges. Offset-aware values must be compared as UTC against the stored
+naive-UTC bookings, and mixing naive with aware values must not fail.
+
+Usage: python test_hall_filters.py   (or collect it with pytest)
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "hall_filters.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app import models  # noqa: E402
+
+# (available_from, available_to, booked hall expected to be listed)
+CASES = [
+    ("2030-01-01T10:00:00", "2030-01-01T11:00:00", False),
+    ("2030-01-01T10:00:00Z", "2030-01-01T11:00:00", False),
+    ("2030-01-01T15:30:00+05:30", "2030-01-01T16:30:00+05:30", False),
+    ("2030-01-01T17:30:00+05:30", "2030-01-01T18:30:00+05:30", True),
+    ("2030-01-01T12:00:00Z", "2030-01-01T13:00:00Z", True),
+]
+
+
+def seed():
+    db = SessionLocal()
+    booked = models.Hall(name="Booked Hall", city="Filter City", capacity=100, price_per_hour=1000)
+    free = models.Hall(name="Free Hall", city="Filter City", capacity=100, price_per_hour=1000)
+    db.add_all([booked, free])
+    db.flush()
+    db.add(models.Booking(
+        hall_id=booked.id,
+        booking_ref="HF-1",
+        start_time=datetime(2030, 1, 1, 10),
+        end_time=datetime(2030, 1, 1, 12),
+        guests=10,
+        status="confirmed",
+    ))
+    db.commit()
+    ids = booked.id, free.id
+    db.close()
+    return ids
+
+
+def test_availability_filter_offsets():
+    client = TestClient(app)
+    booked_id, free_id = seed()
+
+    for available_from, available_to, booked_listed in CASES:
+        response = client.get("/halls/", params={
+            "city": "Filter City",
+            "available_from": available_from,
+            "available_to": available_to,
+        })
+        assert response.status_code == 200, f"{available_from}..{available_to}: {response.text}"
+        listed = {hall["id"] for hall in response.json()["items"]}
+        print(f"{available_from} .. {available_to}: {sorted(listed)}")
+        assert free_id in listed
+        assert (booked_id in listed) == booked_listed, f"{available_from}..{available_to}"
+
+
+if __name__ == "__main__":
+    try:
+        test_availability_filter_offsets()
+    except AssertionError as e:
+        print(f"FAILED: {e}")
+        sys.exit(1)
+    print("OK")
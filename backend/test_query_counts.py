@@ -0,0 +1,116 @@
+"""
+Query-count regression check for the booking list endpoints
+Seeds a throwaway SQLite database at two sizes and counts the SQL
+statements /bookings/me and /admin/bookings issue per request. The count
+must not grow with the number of rows returned (no N+1 lazy loads).
+
+Usage: python test_query_counts.py   (or collect it with pytest)
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "query_counts.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database import engine, SessionLocal  # noqa: E402
+from app import models  # noqa: E402
+
+SIZES = (3, 40)
+ENDPOINTS = ("/bookings/me", "/admin/bookings")
+EMAIL = "counts@example.com"
+PASSWORD = "counts-password"
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def login(client):
+    client.post("/auth/signup", json={"full_name": "Counts", "email": EMAIL, "password": PASSWORD})
+    db = SessionLocal()
+    db.query(models.User).filter(models.User.email == EMAIL).update({models.User.is_admin: True})
+    db.commit()
+    db.close()
+    response = client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+
+
+def seed_bookings(total):
+    """Give the test user exactly `total` bookings, each in its own hall."""
+    db = SessionLocal()
+    user = db.query(models.User).filter(models.User.email == EMAIL).one()
+    db.query(models.Booking).delete()
+    base = datetime(2030, 1, 1)
+    for i in range(total):
+        hall = models.Hall(name=f"Hall {i}", city="Test", capacity=100, price_per_hour=1000)
+        db.add(hall)
+        db.flush()
+        db.add(models.Booking(
+            user_id=user.id,
+            hall_id=hall.id,
+            booking_ref=f"QC-{total}-{i}",
+            start_time=base + timedelta(days=i),
+            end_time=base + timedelta(days=i, hours=2),
+            guests=10,
+            status="pending",
+            total_price=1000,
+        ))
+    db.commit()
+    db.close()
+
+
+def measure(client):
+    counts = {}
+    for path in ENDPOINTS:
+        # warm per-process caches (session cache) so both sizes start equal
+        client.get(path)
+        with count_statements() as statements:
+            response = client.get(path)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        rows = body["items"] if isinstance(body, dict) else body
+        counts[path] = (len(statements), len(rows))
+    return counts
+
+
+def test_query_counts_constant():
+    client = TestClient(app)
+    login(client)
+
+    results = {}
+    for total in SIZES:
+        seed_bookings(total)
+        results[total] = measure(client)
+
+    for path in ENDPOINTS:
+        (small, small_rows), (large, large_rows) = (results[n][path] for n in SIZES)
+        print(f"{path}: {small} statements for {small_rows} rows, {large} for {large_rows} rows")
+        assert (small_rows, large_rows) == SIZES, f"{path} returned an unexpected number of rows"
+        assert small == large, f"{path} statement count grew with rows: {small} -> {large}"
+
+
+if __name__ == "__main__":
+    try:
+        test_query_counts_constant()
+    except AssertionError as e:
+        print(f"FAILED: {e}")
+        sys.exit(1)
+    print("OK")